@@ -1,37 +1,981 @@
 """ TextInput with autocompletion """
-from typing import Any, List, Tuple
+import atexit
+import heapq
+import mmap
+import os
+import sqlite3
+import sys
+import time
+import unicodedata
+import weakref
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from threading import Lock, RLock, Thread
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
 from ae.gui_app import id_of_flow, replace_flow_action
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.core.window import Window
+from kivy.factory import Factory
 from kivy.lang import Builder
+from kivy.properties import ListProperty
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.uix.textinput import TextInput
 from kivy.uix.widget import Widget
 
-from ae.kivy_app import FlowDropDown
+from ae.kivy_app import FlowButton, FlowDropDown
 from ae.kivy_app import KivyMainApp
 
 from relief_canvas import ReliefCanvas
 
 
+MAX_CHAR = chr(0x10FFFF)                                #: highest unicode character (upper bound of prefix ranges)
+
+AC_MAX_RESULTS = 300                                    #: default maximum number of texts shown in the dropdown
+AC_MAX_VISIBLE_ROWS = 9                                 #: maximum number of visible rows of the recycle view dropdown
+AC_ROW_HEIGHT_FACTOR = 1.8                              #: height of a recycle view dropdown row relative to font size
+
+AC_WORD_START_MAX_CANDIDATES = 900                      #: maximum number of texts ranked per word start index lookup
+AC_FUZZY_MAX_DISTANCE = 2                               #: default maximum edit distance of the fuzzy match strategy
+AC_FUZZY_MIN_GRAMS = 4                                  #: minimum number of trigrams shared by fuzzy query and match
+AC_FUZZY_MAX_CANDIDATES = 600                           #: maximum number of fuzzy candidates checked per lookup
+AC_FUZZY_PREFIX_LEN = 24                                #: number of (folded) text characters indexed for fuzzy matches
+AC_FUZZY_MASKS_CACHE_SIZE = 12                          #: number of cached character bit masks of fuzzy queries
+
+AC_LOAD_CHUNK_SIZE = 12000                              #: minimum number of texts added per chunk by the loader
+AC_LOAD_BLOCK_SIZE = 1 << 20                            #: number of bytes decoded at once from a memory-mapped file
+
+AC_USAGE_DB_PATH = 'ac_usage.db'                        #: SQLite side store of the usage models (see ac_usage_db_path)
+AC_USAGE_HALF_LIFE = 30 * 24 * 3600.0                   #: seconds until the weight of a chosen text decays to the half
+AC_USAGE_MAX_ENTRIES = 3000                             #: maximum number of texts remembered by a usage model
+AC_USAGE_FLUSH_DELAY = 6.0                              #: seconds to batch usage changes before writing them
+
+AC_STATS_MAX_SAMPLES = 3000                             #: number of the latest timing samples kept by AcStats
+AC_FRAME_DROP_TIME = 1.5 / 60                           #: minimum frame duration in seconds counted as frame drop
+
+ac_match_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='AcMatch')  #: worker of async matching
+
+
+def fold_text(text: str) -> str:
+    """ convert text into its case- and diacritic-insensitive form (e.g. "Café" -> "cafe").
+
+    :param text:                text to fold.
+    :return:                    case-folded text with all combining characters (diacritics) removed.
+    """
+    return ''.join(char for char in unicodedata.normalize('NFKD', text.casefold()) if not unicodedata.combining(char))
+
+
+def word_starts(text: str) -> List[int]:
+    """ determine the start positions of all words in a text.
+
+    :param text:                text to split into words.
+    :return:                    list of the string indexes of the first character of each word.
+    """
+    return [pos for pos, char in enumerate(text) if char.isalnum() and (not pos or not text[pos - 1].isalnum())]
+
+
+@lru_cache(maxsize=AC_FUZZY_MASKS_CACHE_SIZE)
+def _char_masks(query: str) -> Dict[str, int]:
+    """ map each character of a query to the bit mask of its positions in the query (memoized per keystroke). """
+    masks: Dict[str, int] = dict()
+    for pos, char in enumerate(query):
+        masks[char] = masks.get(char, 0) | 1 << pos
+    return masks
+
+
+def prefix_edit_distance(query: str, text: str, max_distance: int) -> int:
+    """ determine the minimum Levenshtein distance between a query and any prefix of a text.
+
+    uses the bit-parallel algorithm of Myers/Hyyrö, calculating a whole column of the edit distance matrix per text
+    character, with the first row anchored at the start of the text.
+
+    :param query:               query string.
+    :param text:                text to compare the prefixes of.
+    :param max_distance:        maximum distance of interest.
+    :return:                    edit distance or :paramref:`~prefix_edit_distance.max_distance` + 1 if exceeded.
+    """
+    masks = _char_masks(query)
+    last = 1 << len(query) - 1                          # bit of the last query row
+    v_pos = -1                                          # vertical +1 deltas (bits above the query get ignored)
+    v_neg = 0                                           # vertical -1 deltas
+    distance = best = len(query)                        # distance between the query and the empty text prefix
+    for char in text[:len(query) + max_distance]:
+        eq = masks.get(char, 0)
+        x_v = eq | v_neg
+        x_h = (((eq & v_pos) + v_pos) ^ v_pos) | eq
+        h_pos = v_neg | ~(x_h | v_pos)
+        h_neg = v_pos & x_h
+        if h_pos & last:
+            distance += 1
+        elif h_neg & last:
+            distance -= 1
+            if distance < best:
+                best = distance
+        h_pos = h_pos << 1 | 1                          # first row: distance to a text prefix is its length
+        v_pos = h_neg << 1 | ~(x_v | h_pos)
+        v_neg = h_pos & x_v
+    return best if best <= max_distance else max_distance + 1
+
+
+class AcMatchIndex:
+    """ base class of the autocompletion match strategies, each providing an index for fast candidate lookups.
+
+    the :meth:`.candidates` method of a strategy returns a superset of the matching texts, found via the strategy index,
+    whereas the :meth:`.score` method checks each candidate, returning its rank key or None if it does not match.
+
+    :meth:`.extend` can be called by a single (loader) thread while other threads are matching, because the strategies
+    are only appending to their index structures or replacing them with extended copies.
+    """
+    narrowable: bool = True                             #: True if matches of an extended query are a subset
+
+    def __init__(self, texts: Sequence[str] = ()):
+        self.source_len: int = 0                        #: number of indexed texts of the source list
+        self.source_last: Optional[str] = None          #: last indexed text of the source list (for append detect)
+        self.extend(texts)
+
+    def extend(self, texts: Sequence[str]):
+        """ add texts to the index incrementally.
+
+        :param texts:           texts appended to the source list.
+        """
+        if not texts:
+            return
+        self._add_texts(texts)
+        self.source_len += len(texts)
+        self.source_last = texts[-1]
+
+    def _add_texts(self, texts: Sequence[str]):
+        """ add texts to the index structures of the strategy. """
+        raise NotImplementedError
+
+    def prepare(self, query: str) -> Any:
+        """ prepare query for :meth:`.candidates` and :meth:`.score` (e.g. folding), done once per keystroke.
+
+        :param query:           query string (the current text of the text input).
+        :return:                prepared query.
+        """
+        return query
+
+    def candidates(self, prepared: Any) -> List[str]:
+        """ determine the candidate texts of a prepared query from the index.
+
+        :param prepared:        prepared query (see :meth:`.prepare`).
+        :return:                list of candidate texts (superset of the matching texts).
+        """
+        raise NotImplementedError
+
+    def scored(self, prepared: Any, candidates: Optional[Sequence[str]] = None) -> Tuple[List[Tuple[Tuple, str]], int]:
+        """ determine the matching texts of a prepared query together with their rank keys.
+
+        :param prepared:        prepared query (see :meth:`.prepare`).
+        :param candidates:      texts to check (e.g. the matches of the previous query) or None to lookup the index.
+        :return:                tuple of the list of (rank key, text) tuples of the matching texts and the total number
+                                of matching texts (greater than the list length if a strategy capped the lookup).
+        """
+        if candidates is None:
+            candidates = self.candidates(prepared)
+        score = self.score
+        scored = list()
+        for txt in candidates:
+            key = score(prepared, txt)
+            if key is not None:
+                scored.append((key, txt))
+        return scored, len(scored)
+
+    def score(self, prepared: Any, text: str) -> Optional[Tuple]:
+        """ check if a text matches and determine its rank.
+
+        :param prepared:        prepared query (see :meth:`.prepare`).
+        :param text:            candidate text.
+        :return:                rank key (lower values get listed first) or None if the text does not match.
+        """
+        raise NotImplementedError
+
+
+class AcPrefixIndex(AcMatchIndex):
+    """ sorted index of autocompletion texts for prefix lookups in O(log N + k) (k=number of matching texts). """
+    def __init__(self, texts: Sequence[str] = ()):
+        self.sorted_texts: List[str] = list()
+        super().__init__(texts)
+
+    def _add_texts(self, texts: Sequence[str]):
+        sorted_texts = self.sorted_texts + sorted(texts)
+        sorted_texts.sort()                             # timsort merges the two sorted runs in linear time
+        self.sorted_texts = sorted_texts                # swap, so concurrent lookups never see a partial list
+
+    def candidates(self, prepared: str) -> List[str]:
+        sorted_texts = self.sorted_texts
+        beg = bisect_left(sorted_texts, prepared)
+        end = bisect_left(sorted_texts, prepared + MAX_CHAR, beg)
+        return sorted_texts[beg:end]
+
+    def score(self, prepared: str, text: str) -> Optional[Tuple]:
+        return (text, ) if len(text) > len(prepared) and text.startswith(prepared) else None
+
+
+class AcFoldedPrefixIndex(AcMatchIndex):
+    """ case- and diacritic-insensitive prefix index, ranking texts with an exact prefix first. """
+    def __init__(self, texts: Sequence[str] = ()):
+        self.folded: Dict[str, str] = dict()            #: folded form of each indexed text
+        self.sorted_keys: List[Tuple[str, str]] = list()
+        super().__init__(texts)
+
+    def _fold_texts(self, texts: Sequence[str]) -> List[Tuple[str, str]]:
+        folded = self.folded
+        keys = list()
+        for txt in texts:
+            fld = folded.get(txt)
+            if fld is None:
+                fld = folded[txt] = fold_text(txt)
+            keys.append((fld, txt))
+        return keys
+
+    def _add_texts(self, texts: Sequence[str]):
+        sorted_keys = self.sorted_keys + sorted(self._fold_texts(texts))
+        sorted_keys.sort()
+        self.sorted_keys = sorted_keys
+
+    def prepare(self, query: str) -> Tuple[str, str]:
+        return query, fold_text(query)
+
+    def candidates(self, prepared: Tuple[str, str]) -> List[str]:
+        sorted_keys = self.sorted_keys
+        folded_query = prepared[1]
+        beg = bisect_left(sorted_keys, (folded_query, ))
+        end = bisect_left(sorted_keys, (folded_query + MAX_CHAR, ), beg)
+        return [key[-1] for key in sorted_keys[beg:end]]
+
+    def score(self, prepared: Tuple[str, str], text: str) -> Optional[Tuple]:
+        query, folded_query = prepared
+        fld = self.folded[text]
+        if len(fld) <= len(folded_query) or not fld.startswith(folded_query):
+            return None
+        return not text.startswith(query), fld, text
+
+
+class AcWordStartIndex(AcFoldedPrefixIndex):
+    """ folded index of each word start (e.g. "dav" finds "Miles Davis"), ranking matches of the first word first.
+
+    the first words are kept in the sorted keys of the folded prefix index (sorted in rank order), the other words in
+    a separate sorted key list, so that a lookup ranks max. :data:`AC_WORD_START_MAX_CANDIDATES` texts.
+    """
+    def __init__(self, texts: Sequence[str] = ()):
+        self.later_keys: List[Tuple[str, int, str]] = list()     #: sorted keys of the words after the first word
+        super().__init__(texts)
+
+    def _add_texts(self, texts: Sequence[str]):
+        first_keys = list()
+        later_keys = list()
+        for fld, txt in self._fold_texts(texts):
+            starts = word_starts(fld)
+            if starts:
+                first_keys.append((fld[starts[0]:] if starts[0] else fld, txt))
+                later_keys.extend((fld[pos:], word_idx, txt) for word_idx, pos in enumerate(starts[1:], 1))
+        sorted_keys = self.sorted_keys + sorted(first_keys)
+        sorted_keys.sort()
+        self.sorted_keys = sorted_keys
+        sorted_keys = self.later_keys + sorted(later_keys)
+        sorted_keys.sort()
+        self.later_keys = sorted_keys
+
+    def candidates(self, prepared: Tuple[str, str]) -> List[str]:
+        later_keys = self.later_keys
+        folded_query = prepared[1]
+        beg = bisect_left(later_keys, (folded_query, ))
+        end = bisect_left(later_keys, (folded_query + MAX_CHAR, ), beg)
+        texts = super().candidates(prepared)
+        texts.extend(key[-1] for key in later_keys[beg:end])
+        return list(dict.fromkeys(texts))               # remove duplicates of texts with several matching words
+
+    def score(self, prepared: Tuple[str, str], text: str) -> Optional[Tuple]:
+        folded_query = prepared[1]
+        fld = self.folded[text]
+        if fld == folded_query:
+            return None
+        for word_idx, pos in enumerate(word_starts(fld)):
+            if fld.startswith(folded_query, pos):
+                return word_idx, fld, text
+        return None
+
+    def scored(self, prepared: Tuple[str, str], candidates: Optional[Sequence[str]] = None
+               ) -> Tuple[List[Tuple[Tuple, str]], int]:
+        """ rank the matches of an index lookup directly from the index keys, capped to the best ranked texts. """
+        if candidates is not None:
+            return super().scored(prepared, candidates)
+        folded_query = prepared[1]
+        folded = self.folded
+        first_keys = self.sorted_keys
+        beg = bisect_left(first_keys, (folded_query, ))
+        end = bisect_left(first_keys, (folded_query + MAX_CHAR, ), beg)
+        first_end = min(end, beg + AC_WORD_START_MAX_CANDIDATES)
+        word_indexes: Dict[str, int] = dict()           #: index of the first matching word of each text
+        for idx in range(beg, first_end):
+            txt = first_keys[idx][1]
+            if folded[txt] != folded_query:
+                word_indexes[txt] = 0
+        total = len(word_indexes) + end - first_end
+
+        later_keys = self.later_keys
+        beg = bisect_left(later_keys, (folded_query, ))
+        end = bisect_left(later_keys, (folded_query + MAX_CHAR, ), beg)
+        later_end = min(end, beg + AC_WORD_START_MAX_CANDIDATES - len(word_indexes))
+        for idx in range(beg, later_end):
+            _suffix, word_idx, txt = later_keys[idx]
+            if word_idx < word_indexes.get(txt, word_idx + 1):
+                if txt not in word_indexes:
+                    total += 1
+                word_indexes[txt] = word_idx
+        total += end - later_end
+
+        return [((word_idx, folded[txt], txt), txt) for txt, word_idx in word_indexes.items()], total
+
+
+class AcFuzzyIndex(AcMatchIndex):
+    """ fuzzy index, matching text prefixes within a bounded edit distance, using positional trigram postings.
+
+    the postings are keyed by the trigram and its position in the anchored text prefix, because a trigram of the query
+    can only match a text trigram shifted by max. the edit distance. the edit distance gets reduced for short queries,
+    to keep at least :data:`AC_FUZZY_MIN_GRAMS` shared trigrams as lookup criteria, and the number of candidates gets
+    capped to :data:`AC_FUZZY_MAX_CANDIDATES` (preferring the candidates sharing the most trigrams with the query).
+    queries too short for a fuzzy lookup get matched exactly via a sorted list of the folded texts.
+    """
+    narrowable = False
+    max_distance: int = AC_FUZZY_MAX_DISTANCE           #: maximum edit distance (reduced for short queries)
+
+    def __init__(self, texts: Sequence[str] = ()):
+        self.texts: List[str] = list()
+        self.folded: Dict[str, str] = dict()
+        self.postings: Dict[str, List[int]] = dict()    #: ascending text ids of each positional trigram key
+        self.sorted_folded: Tuple[List[str], List[str]] = (list(), list())  #: sorted folded texts and their texts
+        super().__init__(texts)
+
+    @staticmethod
+    def _trigrams(folded: str) -> List[Tuple[str, int]]:
+        padded = "\x02\x02" + folded[:AC_FUZZY_PREFIX_LEN]    # anchor trigrams at the start of the text
+        return [(padded[pos:pos + 3], pos) for pos in range(len(padded) - 2)]
+
+    def _add_texts(self, texts: Sequence[str]):
+        folded = self.folded
+        postings = self.postings
+        for txt in texts:
+            text_id = len(self.texts)
+            self.texts.append(txt)                      # appended before its postings, for concurrent lookups
+            fld = folded.get(txt)
+            if fld is None:
+                fld = folded[txt] = fold_text(txt)
+            for trigram, pos in self._trigrams(fld):
+                key = trigram + chr(pos)
+                posting = postings.get(key)
+                if posting is None:
+                    posting = postings[key] = list()    # lists share the id int objects (array items get boxed)
+                posting.append(text_id)
+
+        sorted_keys = list(zip(*self.sorted_folded)) + sorted((folded[txt], txt) for txt in texts)
+        sorted_keys.sort()
+        self.sorted_folded = [fld for fld, _txt in sorted_keys], [txt for _fld, txt in sorted_keys]
+
+    def prepare(self, query: str) -> Tuple[str, int, List[Tuple[str, int]]]:
+        folded_query = fold_text(query)[:AC_FUZZY_PREFIX_LEN]
+        max_distance = max(min(self.max_distance, (len(folded_query) - AC_FUZZY_MIN_GRAMS) // 3), 0)
+        return folded_query, max_distance, self._trigrams(folded_query)
+
+    def candidates(self, prepared: Tuple[str, int, List[Tuple[str, int]]]) -> List[str]:
+        folded_query, max_distance, trigrams = prepared
+        if not max_distance:                            # exact prefix lookup
+            sorted_folded, sorted_texts = self.sorted_folded
+            beg = bisect_left(sorted_folded, folded_query)
+            end = bisect_left(sorted_folded, folded_query + MAX_CHAR, beg)
+            return sorted_texts[beg:min(end, beg + AC_FUZZY_MAX_CANDIDATES)]
+
+        postings = self.postings
+        gram_ids = list()                               # ids of the texts sharing each trigram of the query
+        for trigram, pos in trigrams:
+            shifted = [postings[key] for key in (trigram + chr(shift)
+                                                 for shift in range(max(pos - max_distance, 0), pos + max_distance + 1))
+                       if key in postings]
+            gram_ids.append((sum(map(len, shifted)), shifted))
+        gram_ids.sort(key=lambda item: item[0])         # process the rarest trigrams first
+
+        min_hits = len(trigrams) - 3 * max_distance     # each edit changes max. 3 trigrams
+        rare_count = len(gram_ids) - min_hits + 1       # each match shares at least one of the rarest trigrams
+        hits: Dict[int, int] = Counter()
+        for _len, shifted in gram_ids[:rare_count]:
+            for posting in shifted:
+                hits.update(posting)
+        text_ids = set(hits)
+        for _len, shifted in gram_ids[rare_count:]:
+            for posting in shifted:
+                hits.update(text_ids.intersection(posting))
+        matched = [(cnt, text_id) for text_id, cnt in hits.items() if cnt >= min_hits]
+        if len(matched) > AC_FUZZY_MAX_CANDIDATES:
+            matched = heapq.nlargest(AC_FUZZY_MAX_CANDIDATES, matched)
+        texts = self.texts
+        return [texts[text_id] for _cnt, text_id in matched]
+
+    def scored(self, prepared: Tuple[str, int, List[Tuple[str, int]]], candidates: Optional[Sequence[str]] = None
+               ) -> Tuple[List[Tuple[Tuple, str]], int]:
+        """ rank queries too short for a fuzzy lookup directly from the sorted folded texts. """
+        folded_query, max_distance, _trigrams = prepared
+        if candidates is not None or max_distance:
+            return super().scored(prepared, candidates)
+        sorted_folded, sorted_texts = self.sorted_folded
+        beg = bisect_left(sorted_folded, folded_query)
+        end = bisect_left(sorted_folded, folded_query + MAX_CHAR, beg)
+        capped_end = min(end, beg + AC_FUZZY_MAX_CANDIDATES)
+        scored = [((0, len(fld), fld, txt), txt)
+                  for fld, txt in zip(sorted_folded[beg:capped_end], sorted_texts[beg:capped_end])
+                  if fld != folded_query]
+        return scored, len(scored) + end - capped_end
+
+    def score(self, prepared: Tuple[str, int, List[Tuple[str, int]]], text: str) -> Optional[Tuple]:
+        folded_query, max_distance, _trigrams = prepared
+        fld = self.folded[text]
+        if fld == folded_query or len(fld) < len(folded_query) - max_distance:
+            return None
+        if fld.startswith(folded_query):
+            distance = 0
+        elif max_distance:
+            distance = prefix_edit_distance(folded_query, fld, max_distance)
+        else:
+            return None
+        return None if distance > max_distance else (distance, len(fld), fld, text)
+
+
+AC_MATCH_STRATEGIES: Dict[str, Type[AcMatchIndex]] = dict(   #: available match strategies (extendable)
+    prefix=AcPrefixIndex, folded=AcFoldedPrefixIndex, word_start=AcWordStartIndex, fuzzy=AcFuzzyIndex)
+
+
+def ac_usage_db_path() -> str:
+    """ determine the path of the SQLite side store of the usage models.
+
+    :return:                    path of :data:`AC_USAGE_DB_PATH` in the user data directory of the running app (or in
+                                the directory of this module and its ini file if no app is running).
+    """
+    app = App.get_running_app()
+    return os.path.join(app.user_data_dir if app else os.path.dirname(os.path.abspath(__file__)), AC_USAGE_DB_PATH)
+
+
+class AcUsageModel:
+    """ frequency/recency model of the chosen autocompletion texts, boosting their rank in the matches.
+
+    each pick of a text increments its weight, which decays exponentially with the half-life
+    :data:`AC_USAGE_HALF_LIFE`. the changes get written in batches into the SQLite side store (see
+    :func:`ac_usage_db_path`).
+    """
+    def __init__(self, name: str, db_path: str = ""):
+        self.name = name
+        self.db_path = db_path or ac_usage_db_path()
+        self.entries: Dict[str, Tuple[float, float]] = dict()   #: weight and timestamp of the last pick of each text
+        self._changed: Dict[str, Optional[Tuple[float, float]]] = dict()    #: unsaved changes (None=removed entry)
+        self._flush_trigger = Clock.create_trigger(self.flush, AC_USAGE_FLUSH_DELAY)
+        self.load()
+        atexit.register(self.flush)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("CREATE TABLE IF NOT EXISTS AcUsage (acModel TEXT, acText TEXT, acWeight REAL, acTime REAL,"
+                           " PRIMARY KEY (acModel, acText)) WITHOUT ROWID")
+        return connection
+
+    def load(self):
+        """ load the entries of this model from the side store. """
+        try:
+            connection = self._connect()
+            try:
+                rows = connection.execute("SELECT acText, acWeight, acTime FROM AcUsage WHERE acModel = ?",
+                                          (self.name, ))
+                self.entries = {txt: (weight, tim) for txt, weight, tim in rows}
+            finally:
+                connection.close()
+        except sqlite3.Error as ex:
+            print(f"AcUsageModel.load(): loading of usage model {self.name} failed with exception {ex}")
+
+    def flush(self, *_args):
+        """ write the batched changes into the side store (in a single transaction). """
+        if not self._changed:
+            return
+        changed, self._changed = self._changed, dict()
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO AcUsage VALUES (?, ?, ?, ?)",
+                        [(self.name, txt, *entry) for txt, entry in changed.items() if entry is not None])
+                    connection.executemany(
+                        "DELETE FROM AcUsage WHERE acModel = ? AND acText = ?",
+                        [(self.name, txt) for txt, entry in changed.items() if entry is None])
+            finally:
+                connection.close()
+        except sqlite3.Error as ex:
+            print(f"AcUsageModel.flush(): saving of usage model {self.name} failed with exception {ex}")
+
+    def weight(self, text: str, now: float) -> float:
+        """ determine the decayed weight of a text.
+
+        :param text:            autocompletion text.
+        :param now:             current timestamp (time.time() value).
+        :return:                decayed weight (0.0 if the text never got chosen).
+        """
+        entry = self.entries.get(text)
+        return entry[0] * 0.5 ** ((now - entry[1]) / AC_USAGE_HALF_LIFE) if entry else 0.0
+
+    def record(self, text: str):
+        """ record the pick of an autocompletion text.
+
+        :param text:            chosen autocompletion text.
+        """
+        now = time.time()
+        entries = self.entries
+        entries[text] = self._changed[text] = (self.weight(text, now) + 1.0, now)
+        if len(entries) > AC_USAGE_MAX_ENTRIES:        # remove the lowest tenth, to not trim on each new text
+            removed = set(heapq.nsmallest(len(entries) - AC_USAGE_MAX_ENTRIES * 9 // 10, entries,
+                                          key=lambda txt: self.weight(txt, now)))
+            self.entries = {txt: entry for txt, entry in entries.items() if txt not in removed}
+            self._changed.update(dict.fromkeys(removed))
+        self._flush_trigger()
+
+
+ac_usage_models: Dict[str, AcUsageModel] = dict()       #: registry of the usage models
+
+
+def ac_usage_model(name: str) -> AcUsageModel:
+    """ get the usage model of the specified name, loading/creating it on first request.
+
+    :param name:                usage model name.
+    :return:                    usage model.
+    """
+    model = ac_usage_models.get(name)
+    if model is None:
+        model = ac_usage_models[name] = AcUsageModel(name)
+    return model
+
+
+class AcMatcher:
+    """ autocompletion matcher, narrowing the previous matches down if the user is extending the query text. """
+    def __init__(self, index: AcMatchIndex):
+        self.index = index
+        self.usage: Optional[AcUsageModel] = None       #: optional usage model, ranking frequently chosen texts first
+        self.last_query: str = ""                       #: query text of the last match
+        self.last_matches: List[str] = list()           #: all (unranked) matching texts of the last query
+        self.last_source_len: int = 0                   #: number of indexed texts at the last query
+        self.lock = RLock()                             #: lock index changes while matching in a worker thread
+
+    def matches(self, query: str, limit: int = 0) -> Tuple[List[str], int]:
+        """ determine the best matching texts of a query.
+
+        :param query:           query string (the current text of the text input).
+        :param limit:           maximum number of returned texts (0=unlimited).
+        :return:                tuple of the list of the best ranked matching texts (top-k selected via a heap) and
+                                the total number of matching texts (an upper bound if the strategy capped the
+                                lookup, counting texts with several matching words more than once).
+        """
+        with self.lock:
+            index = self.index
+            prepared = index.prepare(query)
+            if (index.narrowable and self.last_query and query.startswith(self.last_query)
+                    and self.last_source_len == index.source_len):
+                candidates = self.last_matches          # query got extended: new matches are subset of last matches
+            else:
+                candidates = None                       # deletion, paste or first character: lookup in index
+            scored, total = index.scored(prepared, candidates)
+            self.last_query = query if total == len(scored) else ""  # matches of capped lookups cannot be narrowed
+            self.last_matches = [txt for _key, txt in scored]
+            self.last_source_len = index.source_len
+
+        usage = self.usage
+        if usage and usage.entries:
+            now = time.time()
+            weight = usage.weight
+            scored = [((-weight(txt, now), *key), txt) for key, txt in scored]
+
+        best = heapq.nsmallest(limit, scored) if limit and len(scored) > limit else sorted(scored)
+        return [txt for _key, txt in best], total
+
+    def reset(self):
+        """ reset the narrowing state (e.g. after a change of the indexed texts). """
+        with self.lock:
+            self.last_query = ""
+            self.last_matches = list()
+
+
+class AcVocabulary:
+    """ named autocompletion vocabulary, shared by all text inputs referencing it via the same name.
+
+    the texts are stored as interned strings in a plain list. the index of each used match strategy gets built on first
+    use and references the same text objects, so the texts are not duplicated by the indexes of the strategies.
+
+    the texts of a vocabulary source can be loaded in a background thread (see :meth:`.load`), while the already loaded
+    texts are available for matching. the indexes get built in a background thread too (see :meth:`.index`), so that
+    neither the loading nor the building of an index is blocking the main thread.
+    """
+    def __init__(self, name: str, texts: Sequence[str] = ()):
+        self.name = name
+        self.texts: List[str] = list()                  #: interned texts, shared with the indexes
+        self.indexes: Dict[str, AcMatchIndex] = dict()  #: index of each used match strategy (extended on changes)
+        self.index_builds: Dict[str, Thread] = dict()   #: builder thread of each requested strategy index
+        self._building: Dict[str, AcMatchIndex] = dict()    #: indexes not yet added to self.indexes by their builder
+        self.lock = Lock()                              #: serializes the changes of the texts and the indexes
+        self.ref_count = 0                              #: number of text inputs using this vocabulary
+        self.registered = False                         #: True if registered by the app (never released)
+        self.source = ""                                #: vocabulary source (see :func:`ac_source_texts`)
+        self.loading = False                            #: True while the texts of the source get loaded
+        self.extend(texts)
+
+    def extend(self, texts: Sequence[str]):
+        """ add texts to the vocabulary and to the already built indexes (without blocking concurrent matches).
+
+        :param texts:           texts to add.
+        """
+        texts = [sys.intern(txt) for txt in texts]
+        with self.lock:
+            self.texts.extend(texts)
+            for index in self.indexes.values():
+                index.extend(texts)
+
+    def load(self, source: str) -> Thread:
+        """ start loading the texts of a vocabulary source in a background thread.
+
+        :param source:          vocabulary source (see :func:`ac_source_texts`).
+        :return:                started loader thread.
+        """
+        self.source = source
+        self.loading = True
+        thread = Thread(target=self._load, args=(source, ), name=f"AcLoad-{self.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def _load(self, source: str):
+        """ load texts in chunks, growing with the loaded texts to keep the total costs of the index merges linear. """
+        try:
+            texts = ac_source_texts(source)
+            while True:
+                chunk = list(islice(texts, max(AC_LOAD_CHUNK_SIZE, len(self.texts) // 2)))
+                if not chunk:
+                    break
+                self.extend(chunk)
+        except (OSError, UnicodeDecodeError, ValueError, sqlite3.Error) as ex:
+            print(f"AcVocabulary.load(): loading of vocabulary {self.name} from {source} failed with exception {ex}")
+        finally:
+            self.loading = False
+
+    def index(self, strategy: str) -> AcMatchIndex:
+        """ get the index of a match strategy, starting to build it in a background thread on first request.
+
+        :param strategy:        match strategy name (key of :data:`AC_MATCH_STRATEGIES`).
+        :return:                index of the specified match strategy, which is empty until the builder thread
+                                (see :attr:`.index_builds`) added the texts of this vocabulary.
+        """
+        index = self._building.get(strategy)            # checked first, because the builder moves it to self.indexes
+        if index is None:
+            index = self.indexes.get(strategy)
+        if index is None:                               # no lock, to not wait for the loader in the main thread
+            index = self._building[strategy] = AC_MATCH_STRATEGIES[strategy]()
+            build = self.index_builds[strategy] = Thread(target=self._build_index, args=(strategy, index),
+                                                         name=f"AcIndex-{self.name}-{strategy}", daemon=True)
+            build.start()
+        return index
+
+    def _build_index(self, strategy: str, index: AcMatchIndex):
+        """ add the already loaded texts to a new index, then let the loader extend it with the following texts. """
+        with self.lock:
+            index.extend(self.texts)
+            self.indexes[strategy] = index
+            del self._building[strategy]
+
+
+ac_vocabularies: Dict[str, AcVocabulary] = dict()       #: registry of the shared vocabularies
+
+
+def ac_source_texts(source: str) -> Iterator[str]:
+    """ iterate the (non-empty) texts of a vocabulary source.
+
+    :param source:              vocabulary source, either the path of a text file with one text per line, the path of
+                                a text file prefixed with ``mmap:`` to read it memory-mapped or a SQLite column
+                                specified as ``sqlite:<database path>:<table name>.<column name>``.
+    :return:                    texts iterator/generator.
+    """
+    if source.startswith('sqlite:'):
+        db_path, _, table_column = source[7:].rpartition(':')
+        table, _, column = table_column.partition('.')
+        if not table.isidentifier() or not column.isidentifier():
+            raise ValueError(f"ac_source_texts(): invalid table/column name in vocabulary source {source}")
+        connection = sqlite3.connect(db_path)           # own connection (connections cannot be shared between threads)
+        try:
+            cursor = connection.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")
+            while True:
+                rows = cursor.fetchmany(AC_LOAD_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield from (str(row[0]) for row in rows if row[0] != '')
+        finally:
+            connection.close()
+
+    elif source.startswith('mmap:'):
+        file_path = source[5:]
+        if not os.path.getsize(file_path):
+            return                                      # empty files cannot be mapped
+        with open(file_path, 'rb') as file_handle, \
+                mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            pos, size = 0, len(mapped)
+            while pos < size:
+                end = mapped.rfind(b'\n', pos, pos + AC_LOAD_BLOCK_SIZE) + 1 if pos + AC_LOAD_BLOCK_SIZE < size else 0
+                if end <= pos:                          # last block or line longer than the block size
+                    end = mapped.find(b'\n', pos + AC_LOAD_BLOCK_SIZE) + 1 or size
+                yield from filter(None, (line.rstrip('\r') for line in mapped[pos:end].decode('utf-8').split('\n')))
+                pos = end
+
+    else:
+        with open(source, encoding='utf-8') as file_handle:
+            yield from filter(None, (line.rstrip('\r\n') for line in file_handle))
+
+
+def register_ac_vocabulary(name: str, texts: Sequence[str] = ()) -> AcVocabulary:
+    """ register a new shared autocompletion vocabulary or add texts to an already registered one.
+
+    :param name:                vocabulary name.
+    :param texts:               texts of the vocabulary.
+    :return:                    registered vocabulary.
+    """
+    vocabulary = ac_vocabularies.get(name)
+    if vocabulary is None:
+        vocabulary = ac_vocabularies[name] = AcVocabulary(name, texts)
+    else:
+        vocabulary.extend(texts)
+    vocabulary.registered = True
+    return vocabulary
+
+
+def acquire_ac_vocabulary(name: str) -> AcVocabulary:
+    """ get a registered vocabulary (creating an empty one if not exists) and increment its reference counter.
+
+    :param name:                vocabulary name.
+    :return:                    shared vocabulary.
+    """
+    vocabulary = ac_vocabularies.get(name)
+    if vocabulary is None:
+        vocabulary = ac_vocabularies[name] = AcVocabulary(name)
+    vocabulary.ref_count += 1
+    return vocabulary
+
+
+def release_ac_vocabulary(name: str):
+    """ decrement the reference counter of a vocabulary and remove it from the registry if it is no longer used.
+
+    only vocabularies created on demand by :func:`acquire_ac_vocabulary` get removed, registered ones are kept.
+
+    :param name:                vocabulary name.
+    """
+    vocabulary = ac_vocabularies.get(name)
+    if vocabulary is not None:
+        vocabulary.ref_count -= 1
+        if vocabulary.ref_count <= 0 and not vocabulary.registered:
+            del ac_vocabularies[name]
+
+
+class AcStats:
+    """ latency statistics of autocompletion text inputs (pass an instance via the auto_complete_stats kwarg). """
+    def __init__(self, log: bool = False, max_samples: int = AC_STATS_MAX_SAMPLES):
+        self.log = log                                  #: True to print each recorded sample
+        self.match_times: deque = deque(maxlen=max_samples)    #: durations of the matching per keystroke in seconds
+        self.build_times: deque = deque(maxlen=max_samples)    #: durations of the dropdown builds in seconds
+        self.widgets_created = 0                        #: number of created dropdown item widgets
+        self.widgets_reused = 0                         #: number of reused (recycled) dropdown item widgets
+        self.frames = 0                                 #: number of frames while the dropdown was open
+        self.frame_drops = 0                            #: number of frames exceeding AC_FRAME_DROP_TIME
+
+    def record_match(self, duration: float, shown: int, total: int):
+        """ record the matching of a keystroke.
+
+        :param duration:        matching duration in seconds.
+        :param shown:           number of matching texts shown in the dropdown.
+        :param total:           total number of matching texts.
+        """
+        self.match_times.append(duration)
+        if self.log:
+            print(f"AcStats: matched {total} texts ({shown} shown) in {duration * 1e3:.3f}ms")
+
+    def record_build(self, duration: float, created: int):
+        """ record a build of the dropdown.
+
+        :param duration:        build duration in seconds.
+        :param created:         number of created item widgets (0 if the items get created by a recycle view).
+        """
+        self.build_times.append(duration)
+        self.widgets_created += created
+        if self.log:
+            print(f"AcStats: built dropdown with {created} new widgets in {duration * 1e3:.3f}ms")
+
+    def record_widget(self, reused: bool):
+        """ record the binding of a dropdown item widget of a recycle view to its data.
+
+        :param reused:          True if the widget got recycled, False if it got created.
+        """
+        if reused:
+            self.widgets_reused += 1
+        else:
+            self.widgets_created += 1
+
+    def record_frame(self, duration: float):
+        """ record a frame while the dropdown is open.
+
+        :param duration:        frame duration in seconds.
+        """
+        self.frames += 1
+        if duration > AC_FRAME_DROP_TIME:
+            self.frame_drops += 1
+            if self.log:
+                print(f"AcStats: frame drop of {duration * 1e3:.3f}ms")
+
+    def reset(self):
+        """ reset all statistics. """
+        self.match_times.clear()
+        self.build_times.clear()
+        self.widgets_created = self.widgets_reused = self.frames = self.frame_drops = 0
+
+    @staticmethod
+    def _times_summary(durations: Sequence[float]) -> Dict[str, Any]:
+        durations = sorted(durations)
+        cnt = len(durations)
+        return dict(count=cnt,
+                    mean_ms=sum(durations) / cnt * 1e3 if cnt else 0.0,
+                    p50_ms=durations[cnt // 2] * 1e3 if cnt else 0.0,
+                    p95_ms=durations[int(cnt * 0.95)] * 1e3 if cnt else 0.0,
+                    max_ms=durations[-1] * 1e3 if cnt else 0.0)
+
+    def summary(self) -> Dict[str, Any]:
+        """ determine the summary of the statistics.
+
+        :return:                dict with the count, mean, median, 95th percentile and maximum of the match and build
+                                durations, the widget counters and the frame counters.
+        """
+        return dict(match=self._times_summary(self.match_times), build=self._times_summary(self.build_times),
+                    widgets_created=self.widgets_created, widgets_reused=self.widgets_reused,
+                    frames=self.frames, frame_drops=self.frame_drops)
+
+
+class AcSuggestionButton(RecycleDataViewBehavior, FlowButton):
+    """ recyclable autocompletion dropdown item (the ac_text_input data value is None for the more-texts footer). """
+    ac_text_input: Any = None
+    _ac_bound: bool = False                             #: True if the widget got already bound to a data item
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bind(on_release=self._release)
+
+    def refresh_view_attrs(self, rv: Any, index: int, data: Dict[str, Any]):
+        """ count the created and reused widgets of the recycle view (see :class:`AcStats`). """
+        if rv.stats:
+            rv.stats.record_widget(self._ac_bound)
+        self._ac_bound = True
+        super().refresh_view_attrs(rv, index, data)
+
+    def _release(self, *_args):
+        if self.ac_text_input is not None:
+            self.ac_text_input._select_ac_text(self)
+
+
+class AcSuggestionsView(RecycleView):
+    """ virtualized autocompletion dropdown list, only creating widgets for the visible rows. """
+    def __init__(self, row_height: float = 36.0, stats: Optional[AcStats] = None, **kwargs):
+        self.stats = stats                              #: statistics of the text input showing this view
+        data = kwargs.pop('data', list())               # RecycleView ignores data kwarg passed before its data_model
+        super().__init__(**kwargs)
+        layout = RecycleBoxLayout(viewclass='AcSuggestionButton', orientation='vertical', size_hint_y=None,
+                                  default_size=(None, row_height), default_size_hint=(1, None))
+        layout.bind(minimum_height=layout.setter('height'))
+        self.add_widget(layout)
+        self.data = data
+
+    def scroll_to_index(self, index: int, rows: int):
+        """ scroll the dropdown list to make the row with the passed index visible.
+
+        :param index:           index of the row to show.
+        :param rows:            number of rows in the dropdown list.
+        """
+        if rows > AC_MAX_VISIBLE_ROWS:
+            self.scroll_y = 1.0 - index / (rows - 1)
+
+
+Factory.register('AcSuggestionButton', cls=AcSuggestionButton)
+Factory.register('AcSuggestionsView', cls=AcSuggestionsView)
+
+
 class AcTextInput(ReliefCanvas, TextInput):
     """ autocompletion text input """
-    auto_complete_texts: List[str]
+    auto_complete_texts: List[str] = ListProperty()
     auto_complete_selector_index_ink: Tuple[float, float, float, float]
+    auto_complete_max_results: int                      #: maximum number of shown matching texts (0=unlimited)
+    auto_complete_recycle_view: bool                    #: True to use a RecycleView in the autocompletion dropdown
+    auto_complete_debounce: float                       #: seconds to debounce keystrokes for async matching (0=sync)
+    auto_complete_match_strategy: str                   #: name of the match strategy (key of AC_MATCH_STRATEGIES)
+    auto_complete_vocabulary: str                       #: name of shared vocabulary (overrides auto_complete_texts)
+    auto_complete_source: str                           #: vocabulary source to load (see ac_source_texts())
+    auto_complete_usage: str                            #: name of the usage model ranking chosen texts first (''=off)
+    auto_complete_stats: Optional[AcStats]              #: latency statistics (None=disabled)
 
     _ac_dropdown: FlowDropDown = None                   #: singleton DropDown instance for all TextInput instances
     _matching_ac_texts: List[str] = list()              #: one list instance for all TextInput instances is enough
     _matching_ac_index: int = 0                         #: index of selected text in the drop down matching texts list
+    _ac_matcher: AcMatcher                              #: matcher with the prefix index of the auto_complete_texts
+    _ac_indexed_texts: Optional[List[str]] = None       #: auto_complete_texts list instance covered by the index
+    _ac_generation: int = 0                             #: text change counter (for to discard stale async matches)
+    _ac_match_trigger: Any = None                       #: debounce trigger of the async matching mode
 
     def __init__(self, **kwargs):
-        self.auto_complete_texts = kwargs.pop('auto_complete_texts', list())
+        self.auto_complete_match_strategy = kwargs.pop('auto_complete_match_strategy', 'prefix')
+        self.auto_complete_source = kwargs.pop('auto_complete_source', '')
+        self.auto_complete_vocabulary = kwargs.pop('auto_complete_vocabulary', self.auto_complete_source)
+        if self.auto_complete_vocabulary:
+            vocabulary = acquire_ac_vocabulary(self.auto_complete_vocabulary)
+            if self.auto_complete_source and not vocabulary.source:
+                vocabulary.load(self.auto_complete_source)
+            self._ac_matcher = AcMatcher(vocabulary.index(self.auto_complete_match_strategy))
+            weakref.finalize(self, release_ac_vocabulary, self.auto_complete_vocabulary)
+        else:
+            self._ac_matcher = AcMatcher(AC_MATCH_STRATEGIES[self.auto_complete_match_strategy]())
+        self.auto_complete_usage = kwargs.pop('auto_complete_usage', '')
+        if self.auto_complete_usage:
+            self._ac_matcher.usage = ac_usage_model(self.auto_complete_usage)
         self.auto_complete_selector_index_ink = kwargs.pop('auto_complete_selector_index_ink', (0.69, 0.69, 0.69, 1))
+        self.auto_complete_max_results = kwargs.pop('auto_complete_max_results', AC_MAX_RESULTS)
+        self.auto_complete_recycle_view = kwargs.pop('auto_complete_recycle_view', False)
+        self.auto_complete_debounce = kwargs.pop('auto_complete_debounce', 0.0)
+        self.auto_complete_stats = kwargs.pop('auto_complete_stats', None)
+        if self.auto_complete_debounce:
+            self._ac_match_trigger = Clock.create_trigger(self._ac_start_async_match, self.auto_complete_debounce)
 
         super().__init__(**kwargs)
 
         if not AcTextInput._ac_dropdown:
             AcTextInput._ac_dropdown = FlowDropDown()   # widget instances cannot be created in class var declaration
 
+    def on_auto_complete_texts(self, _self, texts: List[str]):
+        """ auto_complete_texts change event handler, (re-)building the prefix index of the autocompletion texts.
+
+        :param _self:           unneeded duplicate reference to TextInput/self.
+        :param texts:           new/changed list of autocompletion texts.
+        """
+        if self.auto_complete_vocabulary:
+            return                                      # shared vocabulary texts get maintained via AcVocabulary
+        matcher = self._ac_matcher
+        with matcher.lock:
+            index = matcher.index
+            indexed_len = index.source_len
+            if (texts is self._ac_indexed_texts and len(texts) > indexed_len
+                    and (not indexed_len or texts[indexed_len - 1] == index.source_last)):
+                index.extend(texts[indexed_len:])       # texts got appended to the already indexed list
+            else:
+                matcher.index = AC_MATCH_STRATEGIES[self.auto_complete_match_strategy](texts)
+                self._ac_indexed_texts = texts
+            matcher.reset()
+
     def _change_selector_index(self, delta: int):
         """ change/update/set the index of the matching texts in the opened autocompletion dropdown.
 
@@ -39,11 +983,18 @@ class AcTextInput(ReliefCanvas, TextInput):
                                 Set index to zero if the old/last index was on the last item in the matching list.
         """
         cnt = len(self._matching_ac_texts)
-        chi = list(reversed(self._ac_dropdown.container.children))
         idx = self._matching_ac_index
-        chi[idx].square_fill_ink = Window.clearcolor
-        self._matching_ac_index = (idx + delta + cnt) % cnt
-        chi[self._matching_ac_index].square_fill_ink = self.auto_complete_selector_index_ink
+        new_idx = self._matching_ac_index = (idx + delta + cnt) % cnt
+        suggestions_view = self._ac_suggestions_view()
+        if suggestions_view:
+            data = suggestions_view.data                # only the two changed rows get refreshed
+            data[idx] = dict(data[idx], square_fill_ink=Window.clearcolor)
+            data[new_idx] = dict(data[new_idx], square_fill_ink=self.auto_complete_selector_index_ink)
+            suggestions_view.scroll_to_index(new_idx, len(data))
+        else:
+            chi = self._ac_dropdown.container.children  # children are in reversed order
+            chi[-1 - idx].square_fill_ink = Window.clearcolor
+            chi[-1 - new_idx].square_fill_ink = self.auto_complete_selector_index_ink
         # suggestion_text will be removed in Kivy 2.1.0 - see PR #7437
         # self.suggestion_text = self._matching_ac_texts[self._matching_ac_index][len(self.text):]
 
@@ -60,8 +1011,7 @@ class AcTextInput(ReliefCanvas, TextInput):
             if keycode[1] in ('enter', 'right'):
                 # suggestion_text will be removed in Kivy 2.1.0 - see PR #7437
                 # self.suggestion_text will be reset to "" by TextInput instance
-                self.text = self._matching_ac_texts[self._matching_ac_index]
-                self._ac_dropdown.dismiss()
+                self._ac_text_chosen(self._matching_ac_texts[self._matching_ac_index])
                 return True
 
             if keycode[1] == 'down':
@@ -89,30 +1039,158 @@ class AcTextInput(ReliefCanvas, TextInput):
         :param _self:           unneeded duplicate reference to TextInput/self.
         :param text:            new/current text property value.
         """
+        self._ac_generation += 1
+        if text and self._ac_match_trigger:
+            self._ac_match_trigger.cancel()             # restart debounce interval
+            self._ac_match_trigger()
+            return
+
         if text:
-            matching = [txt for txt in self.auto_complete_texts if txt[:-1].startswith(text)]
+            matching, total = self._ac_match(text)
         else:
-            matching = list()
+            if self._ac_match_trigger:
+                self._ac_match_trigger.cancel()
+            matching, total = list(), 0
+            self._ac_matcher.reset()
+        self._show_ac_matches(matching, total)
+
+    def _ac_start_async_match(self, *_args):
+        """ debounce trigger callback, starting the matching of the current text in the worker thread. """
+        ac_match_executor.submit(self._ac_async_match, self._ac_generation, self.text)
+
+    def _ac_async_match(self, generation: int, text: str):
+        """ match text in worker thread and schedule the publishing of the matching texts in the main thread.
+
+        :param generation:      text change counter value at the start of the matching.
+        :param text:            text to match.
+        """
+        if generation != self._ac_generation:
+            return                                      # skip texts changed again while waiting in the executor queue
+        matching, total = self._ac_match(text)
+        Clock.schedule_once(partial(self._ac_publish_async_matches, generation, matching, total))
+
+    def _ac_publish_async_matches(self, generation: int, matching: List[str], total: int, *_args):
+        """ show the matching texts of an async matching in the dropdown if they are not outdated.
+
+        :param generation:      text change counter value at the start of the matching.
+        :param matching:        best matching texts.
+        :param total:           total number of matching texts.
+        """
+        if generation == self._ac_generation:
+            self._show_ac_matches(matching, total)
+
+    def _ac_match(self, text: str) -> Tuple[List[str], int]:
+        """ determine the best matching texts, recording the matching duration if the statistics are enabled.
+
+        :param text:            text to match.
+        :return:                tuple of the best matching texts and the total number of matching texts.
+        """
+        stats = self.auto_complete_stats
+        beg = time.perf_counter() if stats else 0.0
+        matching, total = self._ac_matcher.matches(text, self.auto_complete_max_results)
+        if stats:
+            stats.record_match(time.perf_counter() - beg, len(matching), total)
+        return matching, total
+
+    def _show_ac_matches(self, matching: List[str], total: int):
+        """ show the matching autocompletion texts in the dropdown or close it if there are no matches.
+
+        :param matching:        list of the best matching texts (already limited by auto_complete_max_results).
+        :param total:           total number of matching texts.
+        """
         self._matching_ac_texts[:] = matching
         self._matching_ac_index = 0
 
         if matching:
-            cdm = list()
-            for idx, txt in enumerate(matching):
-                cdm.append(dict(cls='FlowButton', kwargs=dict(text=txt, on_release=self._select_ac_text)))
-            self._ac_dropdown.child_data_maps[:] = cdm
+            self._build_ac_dropdown(matching, total - len(matching))
             if not self._ac_dropdown.attach_to:
                 App.get_running_app().main_app.change_flow(replace_flow_action(self.focus_flow_id, 'suggest'))
                 self._ac_dropdown.open(self)
+                if self.auto_complete_stats:
+                    Clock.unschedule(self._ac_count_frame)  # not yet stopped if the dropdown got reopened quickly
+                    Clock.schedule_interval(self._ac_count_frame, 0)
             self._change_selector_index(0)
             # suggestion_text will be removed in Kivy 2.1.0 - see PR #7437
             # self.suggestion_text = matching[self._matching_ac_index][len(self.text):]
         elif self._ac_dropdown.attach_to:
             self._ac_dropdown.dismiss()
 
+    def _build_ac_dropdown(self, matching: List[str], more_texts: int):
+        """ put the matching texts into the autocompletion dropdown, recording the build duration if enabled.
+
+        :param matching:        matching texts to show.
+        :param more_texts:      number of matching texts not shown because of :attr:`.auto_complete_max_results`.
+        """
+        stats = self.auto_complete_stats
+        beg = time.perf_counter() if stats else 0.0
+        if self.auto_complete_recycle_view:
+            self._show_ac_suggestions_view(matching, more_texts)
+            created = 0                                 # counted by AcSuggestionButton.refresh_view_attrs()
+        else:
+            cdm = list()
+            for idx, txt in enumerate(matching):
+                cdm.append(dict(cls='FlowButton', kwargs=dict(text=txt, on_release=self._select_ac_text)))
+            if more_texts:
+                cdm.append(dict(cls='ImageLabel', kwargs=dict(text=f"{more_texts} more…")))
+            self._ac_dropdown.child_data_maps[:] = cdm
+            created = len(cdm)
+        if stats:
+            stats.record_build(time.perf_counter() - beg, created)
+
+    def _ac_count_frame(self, dt: float) -> Optional[bool]:
+        """ record the frame durations while the dropdown of this text input is open (see :class:`AcStats`).
+
+        :param dt:              duration of the last frame in seconds.
+        :return:                False to stop the recording after the dropdown got closed.
+        """
+        if self._ac_dropdown.attach_to is not self:
+            return False
+        self.auto_complete_stats.record_frame(dt)
+        return None
+
+    def _ac_suggestions_view(self) -> Optional[AcSuggestionsView]:
+        """ determine the recycle view of the autocompletion dropdown.
+
+        :return:                recycle view instance or None if the dropdown is not using a recycle view.
+        """
+        chi = self._ac_dropdown.container.children
+        return chi[0] if self.auto_complete_recycle_view and chi and isinstance(chi[0], AcSuggestionsView) else None
+
+    def _show_ac_suggestions_view(self, matching: List[str], more_texts: int):
+        """ put the matching texts into the recycle view of the autocompletion dropdown, reusing its visible rows.
+
+        :param matching:        matching texts to show.
+        :param more_texts:      number of matching texts not shown because of :attr:`.auto_complete_max_results`.
+        """
+        clear_ink = Window.clearcolor
+        data = [dict(text=txt, ac_text_input=self, square_fill_ink=clear_ink) for txt in matching]
+        if more_texts:
+            data.append(dict(text=f"{more_texts} more…", ac_text_input=None, square_fill_ink=clear_ink))
+        row_height = self.font_size * AC_ROW_HEIGHT_FACTOR
+        height = min(len(data), AC_MAX_VISIBLE_ROWS) * row_height
+
+        suggestions_view = self._ac_suggestions_view()
+        if suggestions_view:
+            suggestions_view.stats = self.auto_complete_stats
+            suggestions_view.data = data
+            suggestions_view.height = height
+            suggestions_view.scroll_y = 1.0
+        else:
+            self._ac_dropdown.child_data_maps[:] = [dict(cls='AcSuggestionsView', kwargs=dict(
+                data=data, row_height=row_height, stats=self.auto_complete_stats, size_hint_y=None, height=height))]
+
     def _select_ac_text(self, selector: Widget):
         """ put selected autocompletion text into text input and close _ac_dropdown """
-        self.text = selector.text
+        self._ac_text_chosen(selector.text)
+
+    def _ac_text_chosen(self, text: str):
+        """ put chosen autocompletion text into text input, record its usage and close _ac_dropdown.
+
+        :param text:            chosen autocompletion text.
+        """
+        self.text = text
+        if self._ac_matcher.usage:
+            self._ac_matcher.usage.record(text)
         self._ac_dropdown.dismiss()
 
 
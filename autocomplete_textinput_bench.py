@@ -0,0 +1,211 @@
+""" headless benchmark of the autocompletion text input (see autocomplete_textinput.py).
+
+replays typing sessions against synthetic vocabularies by assigning the successive text values to the ``text`` property
+of the text input, so that the synchronous or debounced/asynchronous matching, the dropdown updates and the frames while
+the dropdown is open get measured. runs without a GPU/display, using the mock GL backend of kivy and a headless window
+(see headless_window.py). example call::
+
+    python autocomplete_textinput_bench.py --sizes 1000 100000 --strategies prefix fuzzy --output bench_output.txt
+
+the typing sessions get either generated from the vocabulary or loaded from a JSON file (specified by the
+``--sessions`` option) with a list of recorded sessions, each one a list of the successive text input values.
+
+the results get printed (or written into the file specified by the ``--output`` option) in JSON format.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from itertools import product
+from typing import Any, Dict, List, Sequence
+
+from headless_window import install_headless_window
+Window = install_headless_window()
+
+import kivy                                                     # noqa: E402
+from kivy.clock import Clock                                    # noqa: E402
+from kivy.lang import Builder                                   # noqa: E402
+
+from ae.kivy_app import KivyMainApp                             # noqa: E402
+
+import autocomplete_textinput                                   # noqa: E402
+from autocomplete_textinput import (                            # noqa: E402
+    AC_MATCH_STRATEGIES, AcStats, AcTextInput, ac_match_executor, ac_vocabularies, register_ac_vocabulary)
+
+
+BENCH_SIZES = (1000, 100000, 1000000)
+BENCH_SYLLABLES = ('ba', 'bre', 'cha', 'do', 'fen', 'gil', 'ho', 'jas', 'ka', 'kur', 'lin', 'lo', 'mi', 'mos', 'ne',
+                   'pat', 'qui', 'ra', 'sel', 'su', 'tar', 'to', 've', 'wen', 'zi', 'ä', 'ö', 'ü')
+BENCH_DEBOUNCES = (0.0, 0.04)
+BENCH_KV = """\
+<AcTextInput>:
+    focus_flow_id: ''
+    unfocus_flow_id: ''
+    multiline: False
+"""
+BENCH_FRAME_TIME = 1 / 60
+BENCH_KEYSTROKE_INTERVAL = 0.06
+
+
+def synthetic_vocabulary(size: int, seed: int) -> List[str]:
+    """ generate a vocabulary of unique texts, consisting of one to three words built from random syllables.
+
+    :param size:                number of texts.
+    :param seed:                seed of the random generator.
+    :return:                    list of unique texts (in random order).
+    """
+    rnd = random.Random(seed)
+    texts = set()
+    while len(texts) < size:
+        text = " ".join("".join(rnd.choice(BENCH_SYLLABLES) for _ in range(rnd.randint(1, 4)))
+                        for _ in range(rnd.randint(1, 3)))
+        texts.add(text.capitalize() if rnd.random() < 0.3 else text)
+    texts = sorted(texts)                               # set order depends on the (randomized) string hashes
+    rnd.shuffle(texts)
+    return texts
+
+
+def synthetic_sessions(texts: Sequence[str], count: int, seed: int) -> List[List[str]]:
+    """ generate typing sessions, each typing the start of a text of the vocabulary, with occasional corrections.
+
+    :param texts:               vocabulary texts.
+    :param count:               number of sessions.
+    :param seed:                seed of the random generator.
+    :return:                    list of sessions, each one a list of the successive text input values.
+    """
+    rnd = random.Random(seed)
+    sessions = list()
+    for _ in range(count):
+        target = rnd.choice(texts)
+        states = list()
+        for length in range(1, rnd.randint(1, len(target)) + 1):
+            states.append(target[:length])
+            if length > 2 and rnd.random() < 0.09:      # backspace and retype of the last character
+                states.extend((target[:length - 1], target[:length]))
+        sessions.append(states)
+    return sessions
+
+
+def run_frames(until: float):
+    """ run the kivy clock with a frame rate of 60 fps (at least one frame).
+
+    :param until:               perf_counter() value until the frames get run.
+    """
+    while True:
+        Clock.tick()
+        now = time.perf_counter()
+        if now >= until:
+            break
+        time.sleep(min(BENCH_FRAME_TIME, until - now))
+
+
+def bench_case(name: str, sessions: List[List[str]], strategy: str, recycle_view: bool,
+               debounce: float, max_results: int, keystroke_interval: float) -> Dict[str, Any]:
+    """ run a single benchmark case of the matrix.
+
+    :param name:                name of the registered vocabulary.
+    :param sessions:            typing sessions to replay.
+    :param strategy:            match strategy.
+    :param recycle_view:        True to use the recycle view dropdown.
+    :param debounce:            debounce interval of the async matching in seconds (0.0=synchronous matching).
+    :param max_results:         maximum number of texts shown in the dropdown.
+    :param keystroke_interval:  seconds between two keystrokes of a typing session.
+    :return:                    dict with the results of this case.
+    """
+    vocabulary = ac_vocabularies[name]
+    beg = time.perf_counter()
+    vocabulary.index(strategy)                          # built by the first case of the strategy, then reused
+    vocabulary.index_builds[strategy].join()            # the index gets built in a background thread
+    index_time = time.perf_counter() - beg
+
+    stats = AcStats()
+    wid = AcTextInput(auto_complete_vocabulary=name, auto_complete_match_strategy=strategy,
+                      auto_complete_recycle_view=recycle_view, auto_complete_debounce=debounce,
+                      auto_complete_max_results=max_results, auto_complete_stats=stats)
+    Window.add_widget(wid)                              # the dropdown can only be opened on a visible widget
+    keystrokes = 0
+    beg = time.perf_counter()
+    for states in sessions:
+        for text in states:
+            keystroke_beg = time.perf_counter()
+            wid.text = text
+            run_frames(keystroke_beg + keystroke_interval)
+            keystrokes += 1
+        if debounce:                                    # wait for the matching of the last keystroke of the session
+            run_frames(time.perf_counter() + debounce)
+            ac_match_executor.submit(int).result()
+            Clock.tick()
+        wid.text = ""                                   # close the dropdown and reset the matcher for the next session
+        Clock.tick()
+    wall_time = time.perf_counter() - beg
+
+    Window.remove_widget(wid)
+    wid._ac_dropdown.child_data_maps[:] = list()
+    del wid
+    gc.collect()                                        # release the text input and its dropdown
+
+    return dict(
+        vocabulary_size=len(vocabulary.texts), strategy=strategy, recycle_view=recycle_view, debounce=debounce,
+        max_results=max_results, keystroke_interval=keystroke_interval,
+        sessions=len(sessions), keystrokes=keystrokes,
+        index_build_s=index_time,
+        wall_time_s=wall_time,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        **stats.summary())
+
+
+def main(argv: List[str]) -> int:
+    """ parse command line arguments, run the benchmark matrix and output the results as JSON. """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(BENCH_SIZES), help="vocabulary sizes")
+    parser.add_argument('--strategies', nargs='+', default=['prefix'], choices=list(AC_MATCH_STRATEGIES))
+    parser.add_argument('--modes', nargs='+', default=['classic', 'recycle'], choices=('classic', 'recycle'))
+    parser.add_argument('--debounces', nargs='+', type=float, default=list(BENCH_DEBOUNCES),
+                        help="debounce intervals in seconds (0=synchronous matching)")
+    parser.add_argument('--max-results', type=int, default=autocomplete_textinput.AC_MAX_RESULTS)
+    parser.add_argument('--keystroke-interval', type=float, default=BENCH_KEYSTROKE_INTERVAL,
+                        help="seconds between two keystrokes")
+    parser.add_argument('--sessions', default='', help="JSON file with recorded typing sessions")
+    parser.add_argument('--session-count', type=int, default=30, help="number of generated typing sessions")
+    parser.add_argument('--seed', type=int, default=69)
+    parser.add_argument('--output', default='', help="JSON output file (default: print to stdout)")
+    args = parser.parse_args(argv)
+
+    recorded_sessions = None
+    if args.sessions:
+        with open(args.sessions) as file_handle:
+            recorded_sessions = json.load(file_handle)
+
+    main_app = KivyMainApp(app_name='autocomplete_textinput')   # kv rules of the ae widgets need an app instance
+    main_app.framework_win = Window                     # searched by the flow changes of the dropdown
+    Builder.load_string(BENCH_KV)                       # flow ids of the text input (declared in the demo app kv)
+    cases = list()
+    for size in args.sizes:
+        texts = synthetic_vocabulary(size, args.seed)
+        sessions = recorded_sessions or synthetic_sessions(texts, args.session_count, args.seed)
+        name = f'bench{size}'
+        register_ac_vocabulary(name, texts)             # once per size (registering again would add the texts again)
+        for strategy, mode, debounce in product(args.strategies, args.modes, args.debounces):
+            cases.append(bench_case(name, sessions, strategy, mode == 'recycle', debounce,
+                                    args.max_results, args.keystroke_interval))
+        del ac_vocabularies[name]                       # release the texts and indexes of this size
+
+    report = dict(
+        python=platform.python_version(), kivy=kivy.__version__, module=autocomplete_textinput.__file__,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        cases=cases)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file_handle:
+            file_handle.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,42 +1,513 @@
 """ display and update data from sqlite db in a kivy RecycleView """
 import sqlite3
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping, Sequence
+from functools import partial
+from queue import Queue
+from threading import Thread
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.metrics import dp
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.uix.button import Button
-from kivy.properties import BooleanProperty, ListProperty, StringProperty, ObjectProperty, NumericProperty
+from kivy.properties import BooleanProperty, StringProperty, ObjectProperty, NumericProperty
 from kivy.uix.recyclegridlayout import RecycleGridLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.datamodel import RecycleDataModelBehavior
 from kivy.uix.behaviors import FocusBehavior
 from kivy.uix.recycleview.layout import LayoutSelectionBehavior
 from kivy.uix.popup import Popup
 
 
-connection = sqlite3.connect("demo.db")
-cursor = connection.cursor()
-cursor.execute("CREATE TABLE IF NOT EXISTS Callbacks(cID INT, cName TEXT, cbTime INT, cbRems TEXT)")
-cursor.execute("SELECT * FROM Callbacks")
-loaded_db_rows = cursor.fetchall()
-if not loaded_db_rows:
-    cursor.execute("INSERT INTO Callbacks VALUES ('1','Client1','1500','Test1')")
-    cursor.execute("INSERT INTO Callbacks VALUES ('2','Client2','1600','Test2')")
-    cursor.execute("INSERT INTO Callbacks VALUES ('3','Client3','1700','Test3')")
-    connection.commit()
-cursor.execute("SELECT ROWID, * FROM Callbacks ORDER BY ROWID DESC")
-loaded_db_rows = cursor.fetchall()
+DB_PAGE_ROWS = 120                                      #: number of rows fetched per page
+DB_MAX_PAGES = 5                                        #: maximum number of loaded pages (others get evicted)
+DB_PREFETCH_ROWS = 60                                   #: rows left before the window end that trigger a prefetch
+DB_GRID_COLS = 5                                        #: number of grid columns (ROWID and the table columns)
+DB_CELL_KEYS = ('text', 'row_id', 'col_id')             #: keys of the recycle view data items of the grid cells
+DB_COLUMNS = ('ROWID', 'cID', 'cName', 'cbTime', 'cbRems')     #: column names of the grid columns
+DB_FLUSH_DELAY = 1.5                                    #: seconds to collect cell edits before writing them
+DB_UPDATE_STATEMENTS = {                                #: parameterized update statement of each editable column
+    col_name: f"UPDATE Callbacks SET {col_name} = ? WHERE ROWID = ?" for col_name in DB_COLUMNS[1:]}
+DB_TEXT_COLUMNS = ('cName', 'cbRems')                   #: text columns (filtered by prefix, others by equality)
+DB_STATEMENT_CACHE_SIZE = 32                            #: statement cache size (update and page query statements)
+DB_INDEX_PREFIX = 'ix_Callbacks_'                       #: name prefix of the sort/filter indexes created on demand
+DB_MAX_INDEXES = 3                                      #: maximum number of on demand created sort/filter indexes
+MAX_CHAR = chr(0x10FFFF)                                #: highest unicode character (upper bound of prefix ranges)
+
+
+class DbWorker:
+    """ database worker thread, owning its own connection and executing the queued requests in their order.
+
+    the results of the requests get passed to their callbacks in the kivy main thread, so that slow queries or commits
+    (e.g. fsync on a slow SD card) are not blocking the UI.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.requests: Queue = Queue()
+        self.thread = Thread(target=self._run, name='DbWorker', daemon=True)
+        self.thread.start()
+
+    def submit(self, func: Callable, *args, callback: Optional[Callable[[Any], Any]] = None):
+        """ queue a request.
+
+        :param func:            function executed in the worker thread, getting the connection of the worker passed as
+                                first argument, followed by the :paramref:`~submit.args`.
+        :param args:            additional arguments of :paramref:`~submit.func`.
+        :param callback:        optional callable, called in the main thread with the return value of
+                                :paramref:`~submit.func` (or with None if it raised an exception).
+        """
+        self.requests.put((func, args, callback))
+
+    def stop(self):
+        """ execute the already queued requests, then close the connection and stop the worker thread. """
+        self.requests.put(None)
+        self.thread.join()
+
+    def _run(self):
+        db_connection = sqlite3.connect(self.db_path, cached_statements=DB_STATEMENT_CACHE_SIZE)
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            func, args, callback = request
+            try:
+                result = func(db_connection, *args)
+            except Exception as ex:                     # keep the worker thread alive on any failing request
+                print(f"DbWorker: {func.__name__}{args} failed with exception {ex}")
+                result = None
+            if callback:
+                Clock.schedule_once(lambda _dt, cb=callback, res=result: cb(res))
+        db_connection.close()
+
+
+def init_db(db_connection: sqlite3.Connection):
+    """ create the Callbacks table and insert demo rows into it if it is empty. """
+    db_connection.execute("CREATE TABLE IF NOT EXISTS Callbacks(cID INT, cName TEXT, cbTime INT, cbRems TEXT)")
+    if not db_connection.execute("SELECT 1 FROM Callbacks LIMIT 1").fetchone():
+        db_connection.execute("INSERT INTO Callbacks VALUES ('1','Client1','1500','Test1')")
+        db_connection.execute("INSERT INTO Callbacks VALUES ('2','Client2','1600','Test2')")
+        db_connection.execute("INSERT INTO Callbacks VALUES ('3','Client3','1700','Test3')")
+        db_connection.commit()
+
+
+db_statement_timings: Dict[str, List[float]] = dict()  #: executions, rows, first and total duration of each statement
+
+
+def timed_execute(db_connection: sqlite3.Connection, sql: str, params: Any, many: bool = False) -> sqlite3.Cursor:
+    """ execute a SQL statement, recording its timings into :data:`db_statement_timings` (only used by the db worker).
+
+    the first execution of a statement includes its preparation, whereas the following executions are reusing the
+    prepared statement from the statement cache of the connection (the cache is keyed by the SQL string).
+
+    :param db_connection:       database connection.
+    :param sql:                 parameterized SQL statement.
+    :param params:              statement parameters (sequence of parameter tuples if :paramref:`~timed_execute.many`).
+    :param many:                pass True to execute the statement for each parameter tuple via executemany().
+    :return:                    cursor.
+    """
+    beg = time.perf_counter()
+    cursor = db_connection.executemany(sql, params) if many else db_connection.execute(sql, params)
+    duration = time.perf_counter() - beg
+    timings = db_statement_timings.get(sql)
+    if timings is None:
+        db_statement_timings[sql] = [1, len(params) if many else 1, duration, duration]
+    else:
+        timings[0] += 1
+        timings[1] += len(params) if many else 1
+        timings[3] += duration
+    return cursor
+
+
+def print_statement_timings(_db_connection: sqlite3.Connection):
+    """ print the timings of the executed statements (executed in the db worker thread). """
+    lines = ["statement timings (first execution includes the statement preparation):"]
+    for sql, (executions, rows, first, total) in db_statement_timings.items():
+        cached = f"{(total - first) / (executions - 1) * 1e3:.3f}ms" if executions > 1 else "-"
+        lines.append(f"    {sql}: {executions} executions for {rows} rows, first={first * 1e3:.3f}ms,"
+                     f" cached mean={cached}, total={total * 1e3:.3f}ms")
+    print("\n".join(lines))
+
+
+def fetch_rows(db_connection: sqlite3.Connection, sql: str, params: Tuple) -> List[Tuple]:
+    """ fetch the rows of a query. """
+    return timed_execute(db_connection, sql, params).fetchall()
+
+
+def write_cells(db_connection: sqlite3.Connection, edits: Dict[Tuple[int, str], Any]) -> int:
+    """ write cell edits in a single transaction, with one executemany of the update statement of each column.
+
+    :param db_connection:       database connection.
+    :param edits:               new cell values, mapped by ROWID and name of an editable column.
+    :return:                    number of written cell values.
+    """
+    column_params: Dict[str, List[Tuple[Any, int]]] = dict()
+    for (db_id, col_name), value in edits.items():
+        column_params.setdefault(col_name, list()).append((value, db_id))
+    with db_connection:
+        for col_name, params in column_params.items():
+            timed_execute(db_connection, DB_UPDATE_STATEMENTS[col_name], params, many=True)
+    return len(edits)
+
+
+def create_index(db_connection: sqlite3.Connection, col_name: str):
+    """ create the index supporting the sorting and filtering of a column. """
+    db_connection.execute(f"CREATE INDEX IF NOT EXISTS {DB_INDEX_PREFIX}{col_name} ON Callbacks({col_name})")
+
+
+def drop_index(db_connection: sqlite3.Connection, col_name: str):
+    """ drop the index of a column, created by :func:`create_index`. """
+    db_connection.execute(f"DROP INDEX IF EXISTS {DB_INDEX_PREFIX}{col_name}")
+
+
+class DbIndexManager:
+    """ creates the indexes of the sort and filter columns on demand, dropping the least recently used ones.
+
+    the index of a column gets created by the db worker before the first query sorting/filtering by this column, so
+    only the first sort of a big table has to wait for the index creation.
+    """
+    def __init__(self, worker: DbWorker, max_indexes: int = DB_MAX_INDEXES):
+        self.worker = worker
+        self.max_indexes = max_indexes
+        self.indexes: OrderedDict = OrderedDict()       #: columns with an index, ordered by the time of their last use
+        worker.submit(fetch_rows, "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'Callbacks'",
+                      (), callback=self._existing_fetched)
+
+    def _existing_fetched(self, rows: Optional[List[Tuple]]):
+        for name, in rows or ():
+            col_name = name[len(DB_INDEX_PREFIX):]
+            if name.startswith(DB_INDEX_PREFIX) and col_name in DB_COLUMNS:
+                self.indexes.setdefault(col_name)
+                self.indexes.move_to_end(col_name, last=False)
+
+    def require(self, col_names: Iterable[str]):
+        """ ensure the indexes of the specified columns, dropping the least recently used if too many exist.
+
+        :param col_names:       names of the sort and filter columns (ROWID does not need an index).
+        """
+        col_names = set(col_names) - {'ROWID'}
+        for col_name in col_names:
+            if col_name in self.indexes:
+                self.indexes.move_to_end(col_name)
+            else:
+                self.indexes[col_name] = None
+                self.worker.submit(create_index, col_name)
+        while len(self.indexes) > max(self.max_indexes, len(col_names)):
+            col_name, _ = self.indexes.popitem(last=False)
+            self.worker.submit(drop_index, col_name)
+
+
+class DbEditBuffer:
+    """ write-behind buffer of the grid cell edits, keeping only the latest value of each cell.
+
+    the edits get written in a single transaction by the db worker, either :data:`DB_FLUSH_DELAY` seconds after the
+    last edit or on an explicit call of :meth:`.flush` (e.g. on app pause/stop).
+    """
+    def __init__(self, worker: DbWorker, flush_delay: float = DB_FLUSH_DELAY):
+        self.worker = worker
+        self.pending: Dict[Tuple[int, str], Any] = dict()   #: not yet flushed cell values by ROWID and column name
+        self.flushing: Dict[Tuple[int, str], Any] = dict()  #: flushed, but not yet committed cell values
+        self._flush_trigger = Clock.create_trigger(self.flush, flush_delay)
+
+    def add(self, db_id: int, col_name: str, value: Any):
+        """ add/overwrite the edit of a cell.
+
+        :param db_id:           ROWID of the edited row.
+        :param col_name:        column name of the edited cell (has to be a key of :data:`DB_UPDATE_STATEMENTS`).
+        :param value:           new cell value.
+        """
+        if col_name not in DB_UPDATE_STATEMENTS:
+            raise ValueError(f"DbEditBuffer.add(): column {col_name} is not editable")
+        self.pending[(db_id, col_name)] = value
+        self._flush_trigger.cancel()                    # restart the delay, to flush only after the last edit
+        self._flush_trigger()
+
+    def overlay(self, rows: List[Tuple]) -> List[Tuple]:
+        """ apply the not yet committed edits to fetched rows, to not show outdated values of edited cells.
+
+        :param rows:            fetched row tuples (ROWID first).
+        :return:                row tuples with the edited cell values.
+        """
+        if not self.pending and not self.flushing:
+            return rows
+        row_edits: Dict[int, List[Tuple[int, Any]]] = dict()
+        for (db_id, col_name), value in {**self.flushing, **self.pending}.items():
+            row_edits.setdefault(db_id, list()).append((DB_COLUMNS.index(col_name), value))
+        edited_rows = list()
+        for row in rows:
+            edits = row_edits.get(row[0])
+            if edits:
+                row = list(row)
+                for col_id, value in edits:
+                    row[col_id] = value
+                row = tuple(row)
+            edited_rows.append(row)
+        return edited_rows
+
+    def flush(self, *_args, callback: Optional[Callable[[bool], Any]] = None):
+        """ write the pending edits in the db worker.
+
+        :param _args:           unused arguments (passed by the flush trigger).
+        :param callback:        optional callable, called in the main thread after all edits got committed, getting
+                                False passed if the write failed (then the edits are pending again).
+        """
+        self._flush_trigger.cancel()
+        edits, self.pending = self.pending, dict()
+        self.flushing.update(edits)
+        self.worker.submit(write_cells, edits, callback=partial(self._flushed, edits, callback))
+
+    def _flushed(self, edits: Dict[Tuple[int, str], Any], callback: Optional[Callable[[bool], Any]],
+                 written: Optional[int]):
+        flushing = self.flushing
+        for key, value in edits.items():
+            if flushing.get(key) is value:
+                del flushing[key]
+        if written is None:
+            for key, value in edits.items():
+                self.pending.setdefault(key, value)     # retry with the next flush, if not edited again
+            self._flush_trigger()
+        elif written:
+            print(f"DbEditBuffer: committed {written} cell edits")
+        if callback:
+            callback(written is not None)
+
+
+db_worker = DbWorker("demo.db")
+db_worker.submit(init_db)
+db_edit_buffer = DbEditBuffer(db_worker)
+db_index_manager = DbIndexManager(db_worker)
+
+
+class DbPagedSource:
+    """ windowed data source of a db table, holding only the pages of rows around the viewport of the grid.
+
+    the rows get sorted and filtered by the database (see :meth:`.set_criteria`). the pages get fetched via keyset
+    pagination on the sort column and the ROWID (seeking the index instead of scanning an OFFSET). NULL values of the
+    sort column are ordered before all other values (like SQLite does in the index); because any comparison with NULL
+    results in NULL, the keyset conditions are checking them explicitly. if more than :attr:`.max_pages` pages are
+    loaded, then the page at the opposite end of the window gets evicted.
+
+    the queries get determined by :meth:`.page_query` and executed by the caller (e.g. via the :class:`DbWorker`), which
+    then passes the fetched rows to :meth:`.add_page`.
+    """
+    def __init__(self, table: str = 'Callbacks', page_rows: int = DB_PAGE_ROWS, max_pages: int = DB_MAX_PAGES):
+        self.table = table
+        self.page_rows = page_rows
+        self.max_pages = max_pages
+        self.pages: Deque[List[Tuple]] = deque()        #: loaded pages, each one a list of row tuples (ROWID first)
+        self.at_begin = False                           #: True if the first row of the table is in the window
+        self.at_end = False                             #: True if the last row of the table is in the window
+        self.generation = 0                             #: window (re-)load counter (to discard outdated pages)
+        self.sort_col = 'ROWID'                         #: name of the sort column
+        self.sort_desc = True                           #: True to sort in descending order
+        self.filters: Dict[str, str] = dict()           #: filter values by column name
+
+    def set_criteria(self, sort_col: str, sort_desc: bool, filters: Dict[str, str]):
+        """ set the sort and filter criteria (reload the window afterwards with the 'first' page query).
+
+        :param sort_col:        name of the sort column.
+        :param sort_desc:       True to sort in descending order.
+        :param filters:         filter values by column name (prefix of text columns or value of the other columns).
+        """
+        invalid = {sort_col, *filters} - set(DB_COLUMNS)
+        if invalid:
+            raise ValueError(f"DbPagedSource.set_criteria(): invalid column name(s) {invalid}")
+        self.sort_col = sort_col
+        self.sort_desc = sort_desc
+        self.filters = dict(filters)
+
+    def _seek_condition(self, row: Tuple, after: bool) -> Tuple[str, Tuple]:
+        """ determine the keyset condition of the rows following/preceding the specified row in the sort order. """
+        cmp = '<' if self.sort_desc == after else '>'
+        col = self.sort_col
+        if col == 'ROWID':
+            return f"ROWID {cmp} ?", (row[0], )
+        value = row[DB_COLUMNS.index(col)]
+        if value is None:                               # NULL values are the smallest ones, ordered by their ROWID
+            if cmp == '>':
+                return f"({col} IS NULL AND ROWID > ? OR {col} IS NOT NULL)", (row[0], )
+            return f"({col} IS NULL AND ROWID < ?)", (row[0], )
+        if cmp == '>':
+            return f"({col}, ROWID) > (?, ?)", (value, row[0])
+        return f"(({col}, ROWID) < (?, ?) OR {col} IS NULL)", (value, row[0])
+
+    def rows(self) -> List[Tuple]:
+        """ determine the rows of the loaded window.
+
+        :return:                list of the row tuples of all loaded pages.
+        """
+        return [row for page in self.pages for row in page]
+
+    def page_query(self, direction: str) -> Optional[Tuple[str, Tuple]]:
+        """ determine the query to fetch a page.
+
+        :param direction:       'first' to (re-)load the window with the first page of the table, 'next' for the page
+                                following the window or 'prev' for the page preceding the window.
+        :return:                tuple of SQL statement and parameters or None if there are no more rows.
+        """
+        if direction != 'first' and (not self.pages or (self.at_end if direction == 'next' else self.at_begin)):
+            return None
+
+        conditions, params = list(), list()
+        for col_name, value in self.filters.items():
+            if col_name in DB_TEXT_COLUMNS:             # prefix as range condition, to be able to use the index
+                conditions.append(f"{col_name} >= ? AND {col_name} < ?")
+                params.extend((value, value + MAX_CHAR))
+            else:
+                conditions.append(f"{col_name} = ?")
+                params.append(value)
+        if direction != 'first':
+            seek, seek_params = self._seek_condition(*((self.pages[-1][-1], True) if direction == 'next' else
+                                                       (self.pages[0][0], False)))
+            conditions.append(seek)
+            params.extend(seek_params)
+
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        order = "DESC" if self.sort_desc != (direction == 'prev') else "ASC"
+        order_by = f"ROWID {order}" if self.sort_col == 'ROWID' else f"{self.sort_col} {order}, ROWID {order}"
+        return f"SELECT ROWID, * FROM {self.table}{where} ORDER BY {order_by} LIMIT ?", (*params, self.page_rows)
+
+    def add_page(self, direction: str, rows: List[Tuple]) -> Optional[int]:
+        """ add the fetched rows of a page to the window, evicting the page at the opposite end if the window is full.
+
+        :param direction:       direction of the page query (see :meth:`.page_query`).
+        :param rows:            rows fetched with the page query.
+        :return:                number of rows the first row of the window got shifted (number of added rows for 'prev'
+                                or negative number of evicted rows for 'next') or None if there are no more rows.
+        """
+        exhausted = len(rows) < self.page_rows
+        if direction == 'first':
+            self.pages.clear()
+            self.generation += 1
+            if rows:
+                self.pages.append(rows)
+            self.at_begin = True
+            self.at_end = exhausted
+            return 0
+
+        if direction == 'next':
+            self.at_end = exhausted
+            if not rows:
+                return None
+            self.pages.append(rows)
+            shift = 0
+            if len(self.pages) > self.max_pages:
+                shift = -len(self.pages.popleft())
+                self.at_begin = False
+            return shift
+
+        self.at_begin = exhausted
+        if not rows:
+            return None
+        self.pages.appendleft(rows[::-1])
+        if len(self.pages) > self.max_pages:
+            self.pages.pop()
+            self.at_end = False
+        return len(rows)
+
+
+class DbGridCell(Mapping):
+    """ recycle view data item of a grid cell, derived on demand from the row tuple of the data model. """
+    __slots__ = ('model', 'row_id', 'col_id')
+
+    def __init__(self, model: 'DbGridDataModel', row_id: int, col_id: int):
+        self.model = model
+        self.row_id = row_id
+        self.col_id = col_id
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'text':
+            return str(self.model.rows[self.row_id][self.col_id])
+        if key == 'row_id':
+            return self.row_id
+        if key == 'col_id':
+            return self.col_id
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(DB_CELL_KEYS)
+
+    def __len__(self) -> int:
+        return len(DB_CELL_KEYS)
+
+
+class DbGridCells(Sequence):
+    """ read-only sequence of the grid cells of a data model, creating the cell data items on access. """
+    __slots__ = ('model', )
+
+    def __init__(self, model: 'DbGridDataModel'):
+        self.model = model
+
+    def __getitem__(self, index: int) -> DbGridCell:
+        cnt = len(self)
+        if index < 0:
+            index += cnt
+        if not 0 <= index < cnt:
+            raise IndexError(f"DbGridCells index {index} is out of range")
+        return DbGridCell(self.model, *divmod(index, DB_GRID_COLS))
+
+    def __len__(self) -> int:
+        return len(self.model.rows) * DB_GRID_COLS
+
+
+class DbGridDataModel(RecycleDataModelBehavior, EventDispatcher):
+    """ recycle view data model of the grid, holding one row tuple per grid row (instead of one dict per cell).
+
+    the changes of single rows get passed as flags to the recycle view, so that only their cells get refreshed.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rows: List[Tuple] = list()                 #: row tuples (ROWID and the table column values)
+        self.data = DbGridCells(self)                   #: cell data items, used by the recycle view as its data
+
+    def set_rows(self, rows: List[Tuple]):
+        """ replace all rows, refreshing all cells.
+
+        :param rows:            new row tuples.
+        """
+        self.rows = rows
+        self.dispatch('on_data_changed')
+
+    def append_rows(self, rows: List[Tuple]):
+        """ append rows, without refreshing the cells of the already existing rows.
+
+        :param rows:            row tuples to append.
+        """
+        beg = len(self.rows) * DB_GRID_COLS
+        self.rows.extend(rows)
+        self.dispatch('on_data_changed', appended=slice(beg, len(self.rows) * DB_GRID_COLS))
+
+    def update_cell(self, row_id: int, col_id: int, value: Any):
+        """ change the value of a single cell, only refreshing the cells of its row.
+
+        :param row_id:          index of the row in the grid.
+        :param col_id:          index of the column in the grid.
+        :param value:           new cell value.
+        """
+        row = self.rows[row_id]
+        self.rows[row_id] = row[:col_id] + (value, ) + row[col_id + 1:]
+        self.dispatch('on_data_changed', modified=slice(row_id * DB_GRID_COLS, (row_id + 1) * DB_GRID_COLS))
 
 
 class TextInputPopup(Popup):
     """ Edit name popup """
     obj = ObjectProperty()
     obj_text = StringProperty()
-    obj_id = NumericProperty()
+    obj_id = NumericProperty()                          #: db ROWID of the row of the edited cell
+    col_id = NumericProperty()                          #: grid column index of the edited cell
 
     def __init__(self, obj, **kwargs):
         super(TextInputPopup, self).__init__(**kwargs)
         self.obj = obj
         self.obj_text = obj.text
-        print(f"TextInputPopup data index {obj.index}")
+        # captured here, because the recycle view can reuse the button for another cell while the popup is open
+        self.obj_id = obj.r_v.data_model.rows[obj.row_id][0]
+        self.col_id = obj.col_id
+        print(f"TextInputPopup data index {obj.index} with db ROWID of {self.obj_id}")
 
 
 class SelectableRecycleGridLayout(FocusBehavior, LayoutSelectionBehavior,
@@ -47,6 +518,8 @@ class SelectableRecycleGridLayout(FocusBehavior, LayoutSelectionBehavior,
 class SelectableButton(RecycleDataViewBehavior, Button):
     """ Add selection support to the Button """
     index = None
+    row_id = 0
+    col_id = 0
     selected = BooleanProperty(False)
     selectable = BooleanProperty()
     r_v = None
@@ -70,49 +543,158 @@ class SelectableButton(RecycleDataViewBehavior, Button):
 
     def on_press(self):
         """ user pressed edit button """
+        if DB_COLUMNS[self.col_id] not in DB_UPDATE_STATEMENTS:
+            return                                      # ROWID is not editable
         popup = TextInputPopup(self)
         popup.open()
 
-    def update_changes(self, idx, txt):
+    def update_changes(self, db_id, col_id, txt):
         """ update user changes from popup in grid and db """
-        self.text = txt
-        grid_row = int(idx / 5)
-        grid_col = idx % 5
-        rv_data = self.r_v.data
-        assert rv_data[idx]['row_id'] == grid_row
-        assert rv_data[idx]['col_id'] == grid_col
+        col_name = DB_COLUMNS[col_id]
+        db_edit_buffer.add(db_id, col_name, txt)
+        data_model = self.r_v.data_model
+        for grid_row, row in enumerate(data_model.rows):
+            if row[0] == db_id:                         # the row can be moved or evicted by paging/sorting meanwhile
+                data_model.update_cell(grid_row, col_id, txt)
+                break
+        print(f"Changed {col_name} value to '{txt}' of db ROWID {db_id}")
 
-        db_id = rv_data[grid_row * 5]['text']
-        col_name = ['ROWID', 'cID', 'cName', 'cbTime', 'cbRems'][grid_col]
-        # noinspection SqlInjection
-        cursor.execute(f"UPDATE Callbacks SET {col_name} = '{txt}' WHERE ROWID = {db_id}")
-        connection.commit()
-        print(f"Changed {col_name} value to '{txt}' in grid_row=={grid_row} with db ROWID of {db_id}")
+
+class DbHeaderButton(Button):
+    """ clickable column header of the grid, sorting the grid by its column """
+    rv = ObjectProperty(allownone=True)
+    col_name = StringProperty()
+    title = StringProperty()
+    sort_mark = StringProperty()
 
 
 class RV(BoxLayout):
     """ RecycleView"""
-    data_items = ListProperty([])
+    sort_col = StringProperty('ROWID')                  #: name of the sort column
+    sort_desc = BooleanProperty(True)                   #: True if sorted in descending order
 
     def __init__(self, **kwargs):
         """ init RV """
         super(RV, self).__init__(**kwargs)
+        self.data_source = DbPagedSource()
+        self.data_model = self.ids.rec_view.data_model = DbGridDataModel()
+        self._last_scroll_y = 1.0
+        self._fetching = False
         self.get_users()
+        self.ids.rec_view.bind(scroll_y=self.on_rec_view_scroll)
 
     def get_users(self):
-        """ load user data into data_items attribute """
+        """ (re-)load the first page of user data into the grid data model """
+        self._fetch_page('first')
+
+    def _fetch_page(self, direction: str):
+        """ fetch a page of the data source in the db worker thread (if not already fetching another one).
+
+        :param direction:       page direction (see :meth:`DbPagedSource.page_query`).
+        """
+        query = self.data_source.page_query(direction)
+        if query is None or self._fetching and direction != 'first':
+            return
+        self._fetching = True
+        db_worker.submit(fetch_rows, *query,
+                         callback=partial(self._page_fetched, direction, self.data_source.generation))
+
+    def _page_fetched(self, direction: str, generation: int, rows: Optional[List[Tuple]]):
+        """ add the rows of a fetched page to the grid, keeping the same rows in the viewport.
+
+        :param direction:       page direction (see :meth:`DbPagedSource.page_query`).
+        :param generation:      window generation of the data source at the time of the query.
+        :param rows:            fetched rows or None if the query failed.
+        """
+        data_source = self.data_source
+        if direction != 'first' and generation != data_source.generation:
+            return                                      # discard pages of an outdated window
+        self._fetching = False
+        if rows is None:
+            return
+
+        rec_view = self.ids.rec_view
+        row_height = rec_view.children[0].default_size[1] if rec_view.children else dp(26)
+        view_rows = rec_view.height / row_height
+        top_row = (1.0 - rec_view.scroll_y) * max(len(self.data_model.rows) - view_rows, 0.0)
 
-        for row in loaded_db_rows:
-            for col in row:
-                self.data_items.append(col)
+        rows = db_edit_buffer.overlay(rows)
+        shift = data_source.add_page(direction, rows)
+        if shift is None:
+            return
+        if direction == 'next' and not shift:
+            self.data_model.append_rows(rows)           # no page evicted: only the cells of the new rows get refreshed
+        else:
+            self.data_model.set_rows(data_source.rows())
+        if direction == 'first':
+            print(f"loaded {len(self.data_model.rows)} rows")
+            top_row = 0.0
 
-        print("data_items ROWS")
-        for row_num in range(len(loaded_db_rows)):
-            print(self.data_items[row_num * 5: row_num * 5 + 5])
-        print("RecycleView data")
-        rv = self.ids.rec_view
-        for col_num, col_data in enumerate(rv.data):
-            print(f"{col_num}: {col_data}")
+        scrollable_rows = len(self.data_model.rows) - view_rows
+        new_scroll_y = min(max(1.0 - (top_row + shift) / scrollable_rows, 0.0), 1.0) if scrollable_rows > 0 else 1.0
+        self._last_scroll_y = new_scroll_y
+        rec_view.scroll_y = new_scroll_y                # keep the same rows in the viewport
+
+    @staticmethod
+    def sort_mark(col_name: str, sort_col: str, sort_desc: bool) -> str:
+        """ determine the sort order mark of a column header.
+
+        :param col_name:        column name of the header.
+        :param sort_col:        name of the sort column.
+        :param sort_desc:       True if sorted in descending order.
+        :return:                sort order mark or empty string if the grid is not sorted by the column.
+        """
+        return (" v" if sort_desc else " ^") if col_name == sort_col else ""
+
+    def sort_by(self, col_name: str):
+        """ sort the grid by a column, toggling the sort order if the grid is already sorted by this column.
+
+        :param col_name:        name of the column to sort by.
+        """
+        if col_name == self.sort_col:
+            self.sort_desc = not self.sort_desc
+        else:
+            self.sort_col = col_name
+            self.sort_desc = col_name == 'ROWID'
+        self._requery()
+
+    def filter_by(self, col_name: str, value: str):
+        """ filter the grid rows by a column value.
+
+        :param col_name:        name of the column to filter.
+        :param value:           prefix of text columns or value of other columns (empty string to remove the filter).
+        """
+        filters = dict(self.data_source.filters)
+        if value:
+            filters[col_name] = value
+        else:
+            filters.pop(col_name, None)
+        self._requery(filters)
+
+    def _requery(self, filters: Optional[Dict[str, str]] = None):
+        """ reload the grid from the first page with the current sort and the specified filter criteria. """
+        data_source = self.data_source
+        data_source.set_criteria(self.sort_col, self.sort_desc, data_source.filters if filters is None else filters)
+        db_index_manager.require((data_source.sort_col, *data_source.filters))
+        self._fetch_page('first')
+
+    def on_rec_view_scroll(self, rec_view: RecycleView, scroll_y: float):
+        """ prefetch the next/previous page if the viewport is scrolled near the end/begin of the loaded window.
+
+        :param rec_view:        recycle view.
+        :param scroll_y:        new vertical scroll position (1.0=top, 0.0=bottom).
+        """
+        direction = scroll_y - self._last_scroll_y
+        self._last_scroll_y = scroll_y
+        row_height = rec_view.children[0].default_size[1] if rec_view.children else dp(26)
+        view_rows = rec_view.height / row_height
+        rows = len(self.data_model.rows)
+        top_row = (1.0 - scroll_y) * max(rows - view_rows, 0.0)
+
+        if direction < 0 and rows - top_row - view_rows < DB_PREFETCH_ROWS:
+            self._fetch_page('next')
+        elif direction > 0 and top_row < DB_PREFETCH_ROWS:
+            self._fetch_page('prev')
 
 
 class TestApp(App):
@@ -124,6 +706,17 @@ class TestApp(App):
         """ build kivy widgets """
         return RV()
 
+    def on_pause(self):
+        """ write the pending cell edits when the app gets paused """
+        db_edit_buffer.flush()
+        return True
+
+    def on_stop(self):
+        """ write the pending cell edits and execute the queued db requests before the app exits """
+        db_edit_buffer.flush()
+        db_worker.submit(print_statement_timings)
+        db_worker.stop()
+
 
 if __name__ == "__main__":
     TestApp().run()
@@ -0,0 +1,41 @@
+""" headless kivy window for the benchmarks, running without a GPU/display (e.g. in CI).
+
+import this module before any other kivy module and call :func:`install_headless_window` before creating widgets
+(or importing modules that are importing the kivy Window instance)::
+
+    from headless_window import install_headless_window
+    install_headless_window()
+
+the mock GL backend of kivy gets used, because the window providers of kivy (SDL2/X11) cannot create a GL context
+without a display - not even with the SDL dummy/offscreen video drivers.
+"""
+import os
+
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('KIVY_WINDOW', '')                # prevent the loading of a window provider
+os.environ.setdefault('KIVY_CLIPBOARD', 'dummy')
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+from kivy.config import Config                                  # noqa: E402
+Config.set('graphics', 'maxfps', '0')                           # prevent Clock.tick() from sleeping
+
+import kivy.core.window as core_window                          # noqa: E402
+from kivy.base import EventLoop                                 # noqa: E402
+
+
+class HeadlessWindow(core_window.WindowBase):
+    """ window without a native window, rendering into the mock GL backend. """
+
+
+def install_headless_window(width: int = 800, height: int = 600) -> core_window.WindowBase:
+    """ create the headless window and register it as the kivy Window instance.
+
+    :param width:               window width in pixels.
+    :param height:              window height in pixels.
+    :return:                    headless window instance (or the already existing kivy window).
+    """
+    if core_window.Window is None:
+        core_window.Window = HeadlessWindow(width=width, height=height)
+        EventLoop.set_window(core_window.Window)
+    return core_window.Window
@@ -1,31 +1,162 @@
 """ relief canvas """
-from typing import Any, Callable, Tuple, Union
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from math import cos, radians, sin
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+from kivy.clock import Clock
 from kivy.factory import Factory
-from kivy.graphics import Color, Line
+from kivy.graphics import BorderImage, Color, Line, Mesh, Rectangle, RenderContext
 from kivy.graphics.instructions import InstructionGroup
+from kivy.graphics.texture import Texture
 from kivy.lang import Builder
-from kivy.properties import NumericProperty, ObjectProperty
+from kivy.metrics import dpi2px
+from kivy.properties import BooleanProperty, NumericProperty, ObjectProperty, OptionProperty
 from kivy.uix.label import Label
 from kivy.uix.button import Button
-from kivy.uix.widget import Widget
+from kivy.uix.stencilview import StencilView
 
 from ae.gui_app import id_of_flow
 from ae.kivy_app import FlowButton, FlowToggler, KivyMainApp
 
 
 DEF_NUM_PROP_VAL = "99px"
+NUM_PROP_UNITS = ('px', 'dp', 'sp', 'pt', 'mm', 'cm', 'in')    #: units supported by kivy NumericProperty strings
+NUM_PROP_CACHE_SIZE = 666                                       #: maximum number of cached numeric value strings
 
 
 ANGLE_BEG = 87
 ANGLE_END = 267
 
+ELLIPSE_SEGMENTS = 36                                   #: number of mesh segments of each ellipse relief half
+
+RELIEF_RENDER_MODES = ('lines', 'mesh', 'atlas', 'shader')  #: available values of ReliefCanvas.relief_render_mode
+
+# vertex and fragment shaders of the mesh render mode (kivy's default shader does not support vertex colors).
+# the opacity uniform of the own render contexts of the mesh and shader render modes gets set to the opacity of the
+# widget, so the opacity of its ancestors (e.g. of a fading parent layout) does not get applied to these two modes.
+RELIEF_MESH_VS = '''
+#ifdef GL_ES
+    precision highp float;
+#endif
+varying vec4 frag_color;
+attribute vec2 vPosition;
+attribute vec4 vColor;
+uniform mat4 modelview_mat;
+uniform mat4 projection_mat;
+uniform float opacity;
+
+void main(void)
+{
+  frag_color = vColor * vec4(1.0, 1.0, 1.0, opacity);
+  gl_Position = projection_mat * modelview_mat * vec4(vPosition.xy, 0.0, 1.0);
+}
+'''
+
+RELIEF_MESH_FS = '''
+#ifdef GL_ES
+    precision highp float;
+#endif
+varying vec4 frag_color;
+
+void main(void)
+{
+  gl_FragColor = frag_color;
+}
+'''
+
+RELIEF_MESH_FMT = [(b'vPosition', 2, 'float'), (b'vColor', 4, 'float')]
+
+# fragment shader of the shader render mode, drawing all ellipse relief lines analytically within a single quad
+RELIEF_ELLIPSE_FS = '''
+$HEADER$
+
+uniform vec2 quad_size;
+uniform vec2 radius;
+uniform float angle_beg;
+uniform float angle_end;
+uniform float inner_lines;
+uniform float inner_offset;
+uniform vec4 inner_top;
+uniform vec4 inner_bottom;
+uniform float outer_lines;
+uniform vec4 outer_top;
+uniform vec4 outer_bottom;
+
+void main(void)
+{
+  vec2 pos = tex_coord0 * quad_size - quad_size * 0.5;
+  vec2 norm_pos = pos / radius;
+  float k0 = length(norm_pos);
+  float dist = k0 * (k0 - 1.0) / max(length(pos / (radius * radius)), 0.0001);  // approx. distance (>0 outside)
+  float angle = degrees(atan(norm_pos.x, norm_pos.y));                       // kivy angles: 0 at top, clockwise
+  bool top = angle > angle_end - 360.0 && angle < angle_beg;
+
+  float line;
+  float lines;
+  vec4 color;
+  if (dist > 0.0) {
+    line = dist;
+    lines = outer_lines;
+    color = top ? outer_top : outer_bottom;
+  } else {
+    line = -dist - inner_offset;
+    lines = inner_lines;
+    color = top ? inner_top : inner_bottom;
+  }
+  if (lines < 1.0) {
+    discard;
+  }
+  float coverage = smoothstep(0.0, 1.0, line) * (1.0 - smoothstep(lines, lines + 1.0, line));
+  float alpha = 0.9 - clamp(line, 1.0, lines) / lines * 0.81;
+  gl_FragColor = vec4(color.rgb, alpha * coverage * frag_color.a);
+}
+'''
+
+RELIEF_COLORS_CACHE_SIZE = 369                          #: maximum number of memoized relief_colors() results
+
+RELIEF_TABLES_CACHE_SIZE = 96                           #: maximum number of cached relief line tables
+
+RELIEF_ATLAS_MAX_TEXTURES = 96                          #: default maximum number of cached relief textures
+
 
 ColorRGB = Tuple[float, float, float]                   #: color with Red, Green and Blue parts between 0.0 and 1.0
 ColorRGBA = Tuple[float, float, float, float]           #: ink is rgb color and alpha
 ColorOrInk = Union[ColorRGB, ColorRGBA]                 #: color or ink type
 ReliefColors = Union[Tuple[ColorRGB, ColorRGB], Tuple]  #: tuple of (top, bottom) relief colors or empty tuple
 ReliefBrightness = Tuple[float, float]                  #: top and bottom brightness/darken factor
+ReliefBand = Tuple[str, ReliefColors, int, int]         #: relief band kind, colors, number of lines and offset
+ReliefLineGeometry = Tuple[float, List[float], List[float]]  #: alpha, top and bottom line points/ellipse of relief line
+
+
+def num_prop_pixels(num_prop_value: Union[str, int, float]) -> Optional[float]:
+    """ validate a NumericProperty value and convert it into pixels, without the need to create a widget.
+
+    :param num_prop_value:      numeric value (int or float) or string with a number and an optional unit (e.g. "6sp").
+    :return:                    pixel value or None if :paramref:`~num_prop_pixels.num_prop_value` is not assignable
+                                to a NumericProperty.
+    """
+    if isinstance(num_prop_value, (int, float)):
+        return float(num_prop_value)
+    if not isinstance(num_prop_value, str):
+        return None
+    parsed = _parsed_num_prop_str(num_prop_value)
+    return None if parsed is None else dpi2px(*parsed)       # not cached because density/fontscale can change
+
+
+@lru_cache(maxsize=NUM_PROP_CACHE_SIZE)
+def _parsed_num_prop_str(num_prop_str: str) -> Optional[Tuple[float, str]]:
+    """ split and validate NumericProperty value string into number and unit (memoized for kv bindings/keystrokes). """
+    unit = num_prop_str[-2:]
+    if unit in NUM_PROP_UNITS:
+        num_prop_str = num_prop_str[:-2]
+    else:
+        unit = 'px'                                     # kivy NumericProperty converts strings without unit via float()
+    try:
+        return float(num_prop_str), unit
+    except ValueError:
+        return None
 
 
 def relief_colors(color_or_ink: ColorOrInk = (0, 0, 0), darken_factors: ReliefBrightness = (0.6, 0.3)) -> ReliefColors:
@@ -45,6 +176,12 @@ def relief_colors(color_or_ink: ColorOrInk = (0, 0, 0), darken_factors: ReliefBr
     :return:                    tuple with darkened colors calculated from ink or an empty tuple if the alpha
                                 value of paramref:`~relief_colors.ink` has a zero value.
     """
+    return _cached_relief_colors(tuple(color_or_ink), tuple(darken_factors))
+
+
+@lru_cache(maxsize=RELIEF_COLORS_CACHE_SIZE)
+def _cached_relief_colors(color_or_ink: ColorOrInk, darken_factors: ReliefBrightness) -> ReliefColors:
+    """ memoized implementation of :func:`relief_colors` (color tuples are immutable, so the results can be shared). """
     if len(color_or_ink) > 3 and not color_or_ink[3]:
         return ()
     max_col_part = max(color_or_ink[:3])
@@ -56,6 +193,218 @@ def relief_colors(color_or_ink: ColorOrInk = (0, 0, 0), darken_factors: ReliefBr
     return tuple([tuple([col_part * darken for col_part in lightened_color]) for darken in darken_factors])
 
 
+def relief_colors_batch(inks: Sequence[ColorOrInk], darken_factors: ReliefBrightness = (0.6, 0.3)
+                        ) -> List[ReliefColors]:
+    """ calculate the relief colors of many colors/inks at once (e.g. for to recolor a whole theme) in one NumPy pass.
+
+    :param inks:                sequence of N colors or inks (N x 3 or N x 4 array-like).
+    :param darken_factors:      two factors for to darken (1) the top and (2) the bottom relief color parts.
+    :return:                    list with the relief colors of each color/ink, with the same items as returned by
+                                :func:`relief_colors` (an empty tuple for each ink with a zero alpha value).
+    """
+    import numpy                            # optional dependency, only needed for batch calculations
+
+    if not len(inks):
+        return list()
+    inks_arr = numpy.asarray(inks, dtype=float)
+    rgb_arr = inks_arr[:, :3]
+    max_col_parts = rgb_arr.max(axis=1, keepdims=True)
+    brighten_factors = numpy.divide(1.0, max_col_parts, out=numpy.zeros_like(max_col_parts), where=max_col_parts != 0)
+    lightened = numpy.where(max_col_parts == 0, 1.0, rgb_arr * brighten_factors)
+    colors = lightened[:, None, :] * numpy.asarray(darken_factors, dtype=float)[None, :, None]
+    enabled = inks_arr[:, 3] != 0 if inks_arr.shape[1] > 3 else numpy.ones(len(inks_arr), dtype=bool)
+
+    return [tuple(map(tuple, pair)) if on else () for pair, on in zip(colors.tolist(), enabled.tolist())]
+
+
+def relief_alpha(line: int, lines: int) -> float:
+    """ determine the alpha value of a relief line.
+
+    :param line:                relief line number (1 for the line next to the widget border).
+    :param lines:               total number of relief lines.
+    :return:                    alpha value of the relief line.
+    """
+    return 0.9 - (line / lines) * 0.81
+
+
+@lru_cache(maxsize=RELIEF_TABLES_CACHE_SIZE)
+def relief_line_table(lines: int, offset: int) -> Tuple[array, array]:
+    """ determine the alpha ramp and the distances from the widget border of the lines of a relief band.
+
+    :param lines:               number of relief lines.
+    :param offset:              relief offset (distance of the first relief line from the widget border minus one).
+    :return:                    tuple of two compact float arrays with the alpha value and the distance of each line.
+    """
+    return (array('f', [relief_alpha(line, lines) for line in range(1, lines + 1)]),
+            array('f', range(offset + 1, offset + lines + 1)))
+
+
+def ellipse_arc_points(wid_x: float, wid_y: float, wid_width: float, wid_height: float, dist: float,
+                       angle_beg: float, angle_end: float, segments: int = ELLIPSE_SEGMENTS) -> List[float]:
+    """ calculate the points of an ellipse arc, using the angle conventions of :class:`~kivy.graphics.Line`.
+
+    :param wid_x:               x coordinate of the widget.
+    :param wid_y:               y coordinate of the widget.
+    :param wid_width:           widget width.
+    :param wid_height:          widget height.
+    :param dist:                distance of the arc from the ellipse inscribed into the widget (negative=inside).
+    :param angle_beg:           start angle of the arc in degrees (0 is at the top, increasing clockwise).
+    :param angle_end:           end angle of the arc in degrees.
+    :param segments:            number of arc segments.
+    :return:                    flat list of x and y coordinates of the :paramref:`~ellipse_arc_points.segments` + 1
+                                arc points.
+    """
+    radius_x = wid_width / 2
+    radius_y = wid_height / 2
+    center_x = wid_x + radius_x
+    center_y = wid_y + radius_y
+    radius_x += dist
+    radius_y += dist
+    points = list()
+    for seg in range(segments + 1):
+        angle = radians(angle_beg + (angle_end - angle_beg) * seg / segments)
+        points.extend((center_x + sin(angle) * radius_x, center_y + cos(angle) * radius_y))
+    return points
+
+
+def square_edge_points(wid_x: float, wid_y: float, wid_width: float, wid_height: float, dist: float
+                       ) -> Tuple[List[float], List[float]]:
+    """ calculate the points of the top/left and of the bottom/right edges of a square relief line.
+
+    :param wid_x:               x coordinate of the widget.
+    :param wid_y:               y coordinate of the widget.
+    :param wid_width:           widget width.
+    :param wid_height:          widget height.
+    :param dist:                distance of the relief line from the widget border (negative=inside).
+    :return:                    tuple of the flat point lists of the top/left and the bottom/right edges.
+    """
+    x1 = wid_x - dist
+    x2 = wid_x + wid_width + dist
+    y1 = wid_y - dist
+    y2 = wid_y + wid_height + dist
+    return [x1, y1, x1, y2, x2, y2], [x1, y1, x2, y1, x2, y2]
+
+
+def tessellate_band(vertices: List[float], indices: List[int], inner_points: Sequence[float],
+                    outer_points: Sequence[float], inner_color: ColorRGBA, outer_color: ColorRGBA):
+    """ add the triangles of a relief band between two poly lines to the vertices/indices of a mesh.
+
+    :param vertices:            mesh vertices list (format :data:`RELIEF_MESH_FMT`) to extend.
+    :param indices:             mesh indices list to extend.
+    :param inner_points:        flat x/y coordinates of the poly line at the first band edge.
+    :param outer_points:        flat x/y coordinates of the poly line at the opposite band edge (same point count).
+    :param inner_color:         vertex color of the first band edge.
+    :param outer_color:         vertex color of the opposite band edge.
+    """
+    first_idx = len(vertices) // 6
+    point_count = len(inner_points) // 2
+    for idx in range(point_count):
+        vertices.extend((inner_points[idx * 2], inner_points[idx * 2 + 1], *inner_color))
+        vertices.extend((outer_points[idx * 2], outer_points[idx * 2 + 1], *outer_color))
+    for idx in range(first_idx, first_idx + (point_count - 1) * 2, 2):
+        indices.extend((idx, idx + 2, idx + 3, idx, idx + 3, idx + 1))
+
+
+def bake_square_relief(inner_colors: ReliefColors, inner_lines: int, inner_offset: int,
+                       outer_colors: ReliefColors, outer_lines: int) -> Tuple[bytes, int, int]:
+    """ render the inner and outer square relief lines into the pixels of a nine-patch/border-image texture.
+
+    :param inner_colors:        top and bottom colors of the inner relief or empty tuple if disabled.
+    :param inner_lines:         number of inner relief lines.
+    :param inner_offset:        inner relief offset (distance of the first inner line from the widget border).
+    :param outer_colors:        top and bottom colors of the outer relief or empty tuple if disabled.
+    :param outer_lines:         number of outer relief lines.
+    :return:                    tuple of rgba pixel buffer (bottom row first), texture width/height and border width.
+                                The widget border is at the :paramref:`~bake_square_relief.outer_lines` pixel of the
+                                texture; the transparent center pixel gets stretched to the widget size.
+    """
+    if not inner_colors:
+        inner_lines = inner_offset = 0
+    if not outer_colors:
+        outer_lines = 0
+    border = outer_lines + (inner_offset + inner_lines if inner_lines else 0) + 1
+    size = 2 * border + 1
+    pixels = [[0.0, 0.0, 0.0, 0.0] for _ in range(size * size)]   # non-premultiplied rgba, bottom row first
+
+    def _paint(coordinates: set, color: ColorRGB, alpha: float):
+        for col, row in coordinates:
+            pixel = pixels[row * size + col]
+            dst_alpha = pixel[3] * (1.0 - alpha)
+            out_alpha = alpha + dst_alpha
+            pixel[:3] = [(col_part * alpha + dst_part * dst_alpha) / out_alpha
+                         for col_part, dst_part in zip(color, pixel[:3])]
+            pixel[3] = out_alpha
+
+    def _ring(ring: int, colors: ReliefColors, alpha: float):
+        last = size - 1 - ring
+        span = range(ring, last + 1)
+        _paint({(ring, row) for row in span} | {(col, last) for col in span}, colors[0], alpha)   # top left
+        _paint({(col, ring) for col in span} | {(last, row) for row in span}, colors[1], alpha)   # bottom right
+
+    if inner_lines:
+        for alpha, dist in zip(*relief_line_table(inner_lines, inner_offset)):
+            _ring(outer_lines + int(dist), inner_colors, alpha)
+    if outer_lines:
+        for alpha, dist in zip(*relief_line_table(outer_lines, 0)):
+            _ring(outer_lines - int(dist), outer_colors, alpha)
+
+    return bytes(int(round(part * 255)) for pixel in pixels for part in pixel), size, border
+
+
+class ReliefTextureAtlas:
+    """ process-wide LRU cache of the baked square relief textures, shared by all relief widgets. """
+    def __init__(self, max_textures: int = RELIEF_ATLAS_MAX_TEXTURES):
+        self.max_textures = max_textures
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._textures: Dict[Tuple, Tuple[Texture, int]] = OrderedDict()
+
+    def texture(self, inner_colors: ReliefColors, inner_lines: int, inner_offset: int,
+                outer_colors: ReliefColors, outer_lines: int) -> Tuple[Texture, int]:
+        """ get the texture of a square relief from the cache, baking and caching it on the first request.
+
+        :param inner_colors:    top and bottom colors of the inner relief or empty tuple if disabled.
+        :param inner_lines:     number of inner relief lines.
+        :param inner_offset:    inner relief offset.
+        :param outer_colors:    top and bottom colors of the outer relief or empty tuple if disabled.
+        :param outer_lines:     number of outer relief lines.
+        :return:                tuple of the relief texture and the border width (see :func:`bake_square_relief`).
+        """
+        key = (tuple(map(tuple, inner_colors)), inner_lines, inner_offset,    # colors set via kv are lists
+               tuple(map(tuple, outer_colors)), outer_lines)
+        textures = self._textures
+        if key in textures:
+            self.hits += 1
+            textures.move_to_end(key)
+            return textures[key]
+
+        self.misses += 1
+        buffer, size, border = bake_square_relief(*key)
+        texture = Texture.create(size=(size, size), colorfmt='rgba')
+        texture.mag_filter = texture.min_filter = 'nearest'
+        texture.blit_buffer(buffer, colorfmt='rgba', bufferfmt='ubyte')
+        textures[key] = texture, border
+        while len(textures) > self.max_textures:
+            textures.popitem(last=False)            # textures still in use stay alive until their widgets refresh
+            self.evictions += 1
+        return texture, border
+
+    def clear(self):
+        """ remove all cached textures (e.g. on theme change). """
+        self._textures.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """ determine the usage statistics of this cache.
+
+        :return:                dict with the number of cached textures, cache hits, misses and evictions.
+        """
+        return dict(textures=len(self._textures), hits=self.hits, misses=self.misses, evictions=self.evictions)
+
+
+relief_texture_atlas = ReliefTextureAtlas()         #: texture cache of the atlas render mode of all relief widgets
+
+
 class ReliefCanvas:     # (Widget):     # also works without Widget/any ancestor
     """ relief behavior """
 
@@ -73,132 +422,373 @@ class ReliefCanvas:     # (Widget):     # also works without Widget/any ancestor
     relief_square_outer_colors: ReliefColors = ObjectProperty(())
     relief_square_outer_lines: NumericProperty = NumericProperty('3sp')
 
+    relief_render_mode: str = OptionProperty('lines', options=RELIEF_RENDER_MODES)
+    relief_cull_offscreen: bool = BooleanProperty(False)    #: True to hide relief if outside of stencil/scroll view
+
+    relief_coalesced_refreshes: int = 0                     #: number of relief refreshes saved by the coalescing
+
     _relief_graphic_instructions: InstructionGroup
+    _relief_line_instructions: List[Line]                   #: line instructions of the lines render mode
+    _relief_structure: Tuple = ()                           #: render mode, colors and line counts of last rebuild
+    _relief_refresh_pending: bool = False                   #: True if the refresh trigger got fired
+    _relief_refresh_trigger: Callable
+    _relief_cull_trigger: Callable                          #: trigger of the visibility check on viewport changes
+    _relief_mesh_ctx: RenderContext = None
+    _relief_mesh: Mesh = None
+    _relief_border_image: BorderImage = None
+    _relief_atlas_args: Tuple = ()                          #: atlas texture arguments of the border image texture
+    _relief_shader_ctx: RenderContext = None
+    _relief_shader_quad: Rectangle = None
+    _relief_culled: bool = False                            #: True if relief is detached because it is off-screen
+    _relief_viewport: Any = None                            #: nearest stencil/scroll view of the culling mode
+    _relief_outdated: bool = False                          #: True if refreshes got skipped while culled
 
     # attributes provided by the class to be mixed into
     x: float
     y: float
     width: float
     height: float
+    opacity: float
+    parent: Any
     canvas: Any
     bind: Any
+    unbind: Any
+    to_window: Callable
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.bind(pos=self._relief_refresh)
-        self.bind(size=self._relief_refresh)
-        self.bind(relief_ellipse_inner_colors=self._relief_refresh)
-        self.bind(relief_ellipse_inner_lines=self._relief_refresh)
-        self.bind(relief_ellipse_inner_offset=self._relief_refresh)
-        self.bind(relief_ellipse_outer_colors=self._relief_refresh)
-        self.bind(relief_ellipse_outer_lines=self._relief_refresh)
-        self.bind(relief_square_inner_colors=self._relief_refresh)
-        self.bind(relief_square_inner_lines=self._relief_refresh)
-        self.bind(relief_square_inner_offset=self._relief_refresh)
-        self.bind(relief_square_outer_colors=self._relief_refresh)
-        self.bind(relief_square_outer_lines=self._relief_refresh)
+        self._relief_refresh_trigger = Clock.create_trigger(self._relief_refresh)
+        self._relief_cull_trigger = Clock.create_trigger(self._relief_cull_refresh)
+        schedule = self._relief_schedule_refresh
+        self.bind(pos=schedule, size=schedule,
+                  relief_ellipse_inner_colors=schedule, relief_ellipse_inner_lines=schedule,
+                  relief_ellipse_inner_offset=schedule,
+                  relief_ellipse_outer_colors=schedule, relief_ellipse_outer_lines=schedule,
+                  relief_square_inner_colors=schedule, relief_square_inner_lines=schedule,
+                  relief_square_inner_offset=schedule,
+                  relief_square_outer_colors=schedule, relief_square_outer_lines=schedule,
+                  relief_render_mode=schedule, relief_cull_offscreen=schedule, parent=schedule,
+                  opacity=schedule)                         # opacity uniform of the mesh/shader render contexts
 
         self._relief_graphic_instructions = InstructionGroup()
+        self._relief_line_instructions = list()
+        schedule()                                          # relief properties could be already set via kwargs/kv
 
-    def _relief_refresh(self, *_args):
-        """ pos/size or color changed event handler. """
+    def _relief_bands(self) -> List[ReliefBand]:
+        """ determine the relief bands to be drawn.
+
+        :return:                list of (kind, colors, lines, offset) tuples of all enabled relief bands.
+        """
+        bands = list()
+        lines = int(self.relief_ellipse_inner_lines)        # bands with less than one line are disabled (not drawn)
+        if self.relief_ellipse_inner_colors and lines >= 1:
+            bands.append(('ellipse_inner', self.relief_ellipse_inner_colors, lines,
+                          int(self.relief_ellipse_inner_offset)))
+        lines = int(self.relief_ellipse_outer_lines)
+        if self.relief_ellipse_outer_colors and lines >= 1:
+            bands.append(('ellipse_outer', self.relief_ellipse_outer_colors, lines, 0))
+        lines = int(self.relief_square_inner_lines)
+        if self.relief_square_inner_colors and lines >= 1:
+            bands.append(('square_inner', self.relief_square_inner_colors, lines, int(self.relief_square_inner_offset)))
+        lines = int(self.relief_square_outer_lines)
+        if self.relief_square_outer_colors and lines >= 1:
+            bands.append(('square_outer', self.relief_square_outer_colors, lines, 0))
+        return bands
+
+    def _relief_visible(self) -> bool:
+        """ check if the relief of this widget is visible within the viewport of its nearest stencil/scroll view.
+
+        :return:                False if the bounding box of this widget (including the outer relief lines) is
+                                completely outside of the nearest stencil view ancestor, else True.
+        """
+        viewport = self.parent
+        while viewport is not None and not isinstance(viewport, StencilView):
+            parent = getattr(viewport, 'parent', None)          # kivy Window has no parent
+            viewport = parent if parent is not viewport else None
+
+        if viewport is not self._relief_viewport:           # (re-)bind to get notified on scrolling
+            self._relief_bind_viewport(viewport)
+        if viewport is None:
+            return True
+
+        margin = max(0, int(self.relief_ellipse_outer_lines) if self.relief_ellipse_outer_colors else 0,
+                     int(self.relief_square_outer_lines) if self.relief_square_outer_colors else 0)
+        wid_x, wid_y = self.to_window(self.x, self.y)
+        vpt_x, vpt_y = viewport.to_window(viewport.x, viewport.y)
+        return (wid_x - margin < vpt_x + viewport.width and vpt_x < wid_x + self.width + margin
+                and wid_y - margin < vpt_y + viewport.height and vpt_y < wid_y + self.height + margin)
+
+    def _relief_bind_viewport(self, viewport: Any):
+        """ bind the visibility check of the culling mode to the viewport changes (unbinding the previous viewport).
+
+        :param viewport:        nearest stencil/scroll view ancestor or None to only unbind the previous viewport.
+        """
+        check = self._relief_cull_trigger
+        if self._relief_viewport is not None:
+            self._relief_viewport.unbind(pos=check, size=check)
+            if hasattr(self._relief_viewport, 'scroll_y'):
+                self._relief_viewport.unbind(scroll_x=check, scroll_y=check)
+        if viewport is not None:
+            viewport.bind(pos=check, size=check)
+            if hasattr(viewport, 'scroll_y'):
+                viewport.bind(scroll_x=check, scroll_y=check)
+        self._relief_viewport = viewport
+
+    def _relief_set_culled(self, culled: bool):
+        """ detach the relief graphic instructions from the canvas if culled, else re-attach them.
+
+        :param culled:          True if the relief is off-screen.
+        """
         if self._relief_graphic_instructions.length():
-            self.canvas.after.remove(self._relief_graphic_instructions)
-            self._relief_graphic_instructions.clear()
+            if culled:
+                self.canvas.after.remove(self._relief_graphic_instructions)
+            else:
+                self.canvas.after.add(self._relief_graphic_instructions)
+        self._relief_culled = culled
+
+    def _relief_cull_refresh(self, *_args):
+        """ viewport pos/size/scroll changed event handler, only checking the visibility of the relief.
+
+        The geometry of the relief is not affected by the viewport, so the relief gets only detached/attached, apart
+        from a relief that got outdated while culled, which gets completely refreshed.
+        """
+        if not self.relief_cull_offscreen or self._relief_refresh_pending:
+            return                                          # the pending refresh checks the visibility anyway
+        culled = not self._relief_visible()
+        if culled == self._relief_culled:
+            return
+        if culled or not self._relief_outdated:
+            self._relief_set_culled(culled)
+        else:
+            self._relief_schedule_refresh()
+
+    def _relief_schedule_refresh(self, *_args):
+        """ pos/size, color or any other relief property changed event handler.
+
+        All changes within the same frame get coalesced into a single call of :meth:`._relief_refresh`.
+        """
+        if self._relief_refresh_pending:
+            self.relief_coalesced_refreshes += 1
+        else:
+            self._relief_refresh_pending = True
+            self._relief_refresh_trigger()
 
+    def _relief_refresh(self, *_args):
+        """ refresh the relief graphic instructions (called by the trigger at the next frame).
+
+        The graphic instructions get only re-allocated if the render mode, the relief colors or the number of relief
+        lines changed, else only the coordinates of the already existing instructions will be updated in-place.
+        """
+        self._relief_refresh_pending = False
+        if self.relief_cull_offscreen:
+            if not self._relief_visible():
+                if not self._relief_culled:
+                    self._relief_set_culled(True)
+                self._relief_outdated = True
+                return
+        elif self._relief_viewport is not None:             # culling got switched off
+            self._relief_bind_viewport(None)
+        if self._relief_culled:                             # back on screen: re-attach and update outdated geometry
+            self._relief_set_culled(False)
+        self._relief_outdated = False
+
+        bands = self._relief_bands()
+        structure = (self.relief_render_mode, tuple(band[:3] for band in bands))
+        rebuild = structure != self._relief_structure
+        if rebuild:
+            if self._relief_graphic_instructions.length():
+                self.canvas.after.remove(self._relief_graphic_instructions)
+                self._relief_graphic_instructions.clear()
+            self._relief_line_instructions.clear()
+            self._relief_structure = structure
+
+        if self.relief_render_mode == 'mesh':
+            self._relief_mesh_refresh(bands, rebuild)
+        elif self.relief_render_mode == 'shader':
+            self._relief_mesh_refresh([band for band in bands if band[0].startswith('square')], rebuild)
+            self._relief_shader_refresh([band for band in bands if band[0].startswith('ellipse')], rebuild)
+        elif self.relief_render_mode == 'atlas':
+            self._relief_lines_refresh([band for band in bands if band[0].startswith('ellipse')], rebuild)
+            self._relief_atlas_refresh([band for band in bands if band[0].startswith('square')], rebuild)
+        else:
+            self._relief_lines_refresh(bands, rebuild)
+
+        if rebuild and self._relief_graphic_instructions.length():
+            self.canvas.after.add(self._relief_graphic_instructions)
+
+    def _relief_lines_refresh(self, bands: List[ReliefBand], rebuild: bool):
+        """ render the relief with one color and one line instruction per relief line and side.
+
+        :param bands:           enabled relief bands (see :meth:`._relief_bands`).
+        :param rebuild:         pass True to create new instructions, else the coordinates of the line instructions
+                                created by the last rebuild will be updated.
+        """
         add = self._relief_graphic_instructions.add
+        line_instructions = self._relief_line_instructions
         pos_size = self.x, self.y, self.width, self.height
-        if self.relief_ellipse_inner_colors and self.relief_ellipse_inner_lines:
-            self._relief_ellipse_inner_refresh(add, *self.relief_ellipse_inner_colors, *pos_size)
-        if self.relief_ellipse_outer_colors and self.relief_ellipse_outer_lines:
-            self._relief_ellipse_outer_refresh(add, *self.relief_ellipse_outer_colors, *pos_size)
-        if self.relief_square_inner_colors and self.relief_square_inner_lines:
-            self._relief_square_inner_refresh(add, *self.relief_square_inner_colors, *pos_size)
-        if self.relief_square_outer_colors and self.relief_square_outer_lines:
-            self._relief_square_outer_refresh(add, *self.relief_square_outer_colors, *pos_size)
+        line_idx = 0
+        for kind, (top_color, bottom_color), lines, offset in bands:
+            geometry_attr = 'ellipse' if kind.startswith('ellipse') else 'points'
+            band_geometries = self._relief_band_lines(kind, lines, offset, *pos_size)
+            for alpha, top_geometry, bottom_geometry in band_geometries:
+                if rebuild:
+                    top_line = Line(**{geometry_attr: top_geometry})
+                    bottom_line = Line(**{geometry_attr: bottom_geometry})
+                    add(Color(*top_color, alpha))                       # top left
+                    add(top_line)
+                    add(Color(*bottom_color, alpha))                    # bottom right
+                    add(bottom_line)
+                    line_instructions.extend((top_line, bottom_line))
+                else:
+                    setattr(line_instructions[line_idx], geometry_attr, top_geometry)
+                    setattr(line_instructions[line_idx + 1], geometry_attr, bottom_geometry)
+                    line_idx += 2
 
-        if self._relief_graphic_instructions.length():
-            self.canvas.after.add(self._relief_graphic_instructions)
+    def _relief_mesh_refresh(self, bands: List[ReliefBand], rebuild: bool):
+        """ render all relief bands as a single vertex colored mesh, resulting in one draw call per widget.
 
-    def _relief_ellipse_inner_refresh(self, add_instruction: Callable,
-                                      top_color: ColorRGB, bottom_color: ColorRGB,
-                                      wid_x: float, wid_y: float, wid_width: float, wid_height: float):
-        """ ellipse pos/size or color changed event handler. """
-        lines = int(self.relief_ellipse_inner_lines)
-        offset = int(self.relief_ellipse_inner_offset)
-        for line in range(1, lines + 1):
-            alpha = 0.9 - (line / lines) * 0.81
-            line += offset
-            line2 = 2 * line
-
-            in_x1 = wid_x + line
-            in_y1 = wid_y + line
-            in_width = wid_width - line2
-            in_height = wid_height - line2
-
-            add_instruction(Color(*top_color, alpha))                   # inside top left
-            add_instruction(Line(ellipse=[in_x1, in_y1, in_width, in_height, ANGLE_END, 360 + ANGLE_BEG]))
-            add_instruction(Color(*bottom_color, alpha))                # inside bottom right
-            add_instruction(Line(ellipse=[in_x1, in_y1, in_width, in_height, ANGLE_BEG, ANGLE_END]))
-
-    def _relief_ellipse_outer_refresh(self, add_instruction: Callable,
-                                      top_color: ColorRGB, bottom_color: ColorRGB,
-                                      wid_x: float, wid_y: float, wid_width: float, wid_height: float):
-        """ ellipse pos/size or color changed event handler. """
-        lines = int(self.relief_ellipse_outer_lines)
-        for line in range(1, lines + 1):
-            alpha = 0.9 - (line / lines) * 0.81
-            line2 = 2 * line
-
-            out_x1 = wid_x - line
-            out_y1 = wid_y - line
-            out_width = wid_width + line2
-            out_height = wid_height + line2
-
-            add_instruction(Color(*top_color, alpha))                   # outside top left
-            add_instruction(Line(ellipse=[out_x1, out_y1, out_width, out_height, ANGLE_END, 360 + ANGLE_BEG]))
-            add_instruction(Color(*bottom_color, alpha))                # outside bottom right
-            add_instruction(Line(ellipse=[out_x1, out_y1, out_width, out_height, ANGLE_BEG, ANGLE_END]))
-
-    def _relief_square_inner_refresh(self, add_instruction: Callable,
-                                     top_color: ColorRGB, bottom_color: ColorRGB,
-                                     wid_x: float, wid_y: float, wid_width: float, wid_height: float):
-        """ square pos/size or color changed event handler. """
-        lines = int(self.relief_square_inner_lines)
-        offset = int(self.relief_square_inner_offset)
-        for line in range(1, lines + 1):
-            alpha = 0.9 - (line / lines) * 0.81
-            line += offset
-            line2 = 2 * line
-
-            in_x1 = wid_x + line
-            in_x2 = in_x1 + wid_width - line2
-            in_y1 = wid_y + line
-            in_y2 = in_y1 + wid_height - line2
-
-            add_instruction(Color(*top_color, alpha))                   # inside top left
-            add_instruction(Line(points=[in_x1, in_y1, in_x1, in_y2, in_x2, in_y2]))
-            add_instruction(Color(*bottom_color, alpha))                # inside bottom right
-            add_instruction(Line(points=[in_x1, in_y1, in_x2, in_y1, in_x2, in_y2]))
-
-    def _relief_square_outer_refresh(self, add_instruction: Callable,
-                                     top_color: ColorRGB, bottom_color: ColorRGB,
-                                     wid_x: float, wid_y: float, wid_width: float, wid_height: float):
-        """ square pos/size or color changed event handler. """
-        lines = int(self.relief_square_outer_lines)
-        for line in range(1, lines + 1):
-            alpha = 0.9 - (line / lines) * 0.81
-            line2 = 2 * line
+        :param bands:           enabled relief bands (see :meth:`._relief_bands`).
+        :param rebuild:         pass True to (re-)add the mesh render context to the relief instructions group.
+        """
+        vertices: List[float] = list()
+        indices: List[int] = list()
+        pos_size = self.x, self.y, self.width, self.height
+        for kind, colors, lines, offset in bands:
+            sign = -1 if kind.endswith('inner') else 1
+            dist_beg = sign * (offset + 0.5)            # half pixel widening to cover the outer line halves
+            dist_end = sign * (offset + lines + 0.5)
+            alphas = relief_line_table(lines, offset)[0]
+            alpha_beg = alphas[0]
+            alpha_end = alphas[-1]
+            for color, angle_beg, angle_end, edge_idx in zip(colors, (ANGLE_END, ANGLE_BEG),
+                                                               (360 + ANGLE_BEG, ANGLE_END), (0, 1)):
+                if kind.startswith('ellipse'):
+                    beg_points = ellipse_arc_points(*pos_size, dist_beg, angle_beg, angle_end)
+                    end_points = ellipse_arc_points(*pos_size, dist_end, angle_beg, angle_end)
+                else:
+                    beg_points = square_edge_points(*pos_size, dist_beg)[edge_idx]
+                    end_points = square_edge_points(*pos_size, dist_end)[edge_idx]
+                tessellate_band(vertices, indices, beg_points, end_points, (*color, alpha_beg), (*color, alpha_end))
+
+        if not indices:
+            return
+        if self._relief_mesh_ctx is None:
+            # noinspection PyUnresolvedReferences
+            import kivy.core.window     # not needed directly, import to ensure creation of window render context
+            self._relief_mesh_ctx = RenderContext(vs=RELIEF_MESH_VS, fs=RELIEF_MESH_FS, use_parent_modelview=True,
+                                                  use_parent_projection=True, use_parent_frag_modelview=True)
+            with self._relief_mesh_ctx:
+                self._relief_mesh = Mesh(fmt=RELIEF_MESH_FMT, mode='triangles')
+        self._relief_mesh_ctx['opacity'] = float(getattr(self, 'opacity', 1.0))
+        self._relief_mesh.vertices = vertices
+        self._relief_mesh.indices = indices
+        if rebuild:
+            self._relief_graphic_instructions.add(self._relief_mesh_ctx)
 
-            out_x1 = wid_x - line
-            out_x2 = out_x1 + wid_width + line2
-            out_y1 = wid_y - line
-            out_y2 = out_y1 + wid_height + line2
+    def _relief_atlas_refresh(self, bands: List[ReliefBand], rebuild: bool):
+        """ render the square relief bands as one border image with a texture shared by identically styled widgets.
 
-            add_instruction(Color(*top_color, alpha))                   # outside upper left
-            add_instruction(Line(points=[out_x1, out_y1, out_x1, out_y2, out_x2, out_y2]))
-            add_instruction(Color(*bottom_color, alpha))                # outside bottom right
-            add_instruction(Line(points=[out_x1, out_y1, out_x2, out_y1, out_x2, out_y2]))
+        :param bands:           enabled square relief bands (see :meth:`._relief_bands`).
+        :param rebuild:         pass True to create a new border image instruction, else the texture, pos and size of
+                                the border image created by the last rebuild will be updated.
+        """
+        if not bands:
+            return
+        inner = outer = ((), 0, 0)
+        for kind, colors, lines, offset in bands:
+            if kind == 'square_inner':
+                inner = (colors, lines, offset)
+            else:
+                outer = (colors, lines, offset)
+        if rebuild:
+            self._relief_border_image = BorderImage()
+            self._relief_graphic_instructions.add(Color(1, 1, 1, 1))
+            self._relief_graphic_instructions.add(self._relief_border_image)
+        border_image = self._relief_border_image
+        atlas_args = (*inner, *outer[:2])
+        if rebuild or atlas_args != self._relief_atlas_args:   # pos/size changes are not using the atlas
+            texture, border = relief_texture_atlas.texture(*atlas_args)
+            border_image.texture = texture
+            border_image.border = (border, border, border, border)
+            self._relief_atlas_args = atlas_args
+        outer_lines = outer[1]
+        border_image.pos = self.x - outer_lines, self.y - outer_lines
+        border_image.size = self.width + 2 * outer_lines, self.height + 2 * outer_lines
+
+    def _relief_shader_refresh(self, bands: List[ReliefBand], rebuild: bool):
+        """ render the ellipse relief bands with a single quad and a fragment shader (line counts are uniforms).
+
+        :param bands:           enabled ellipse relief bands (see :meth:`._relief_bands`).
+        :param rebuild:         pass True to (re-)add the shader render context to the relief instructions group.
+        """
+        if not bands:
+            return
+        if self._relief_shader_ctx is None:
+            # noinspection PyUnresolvedReferences
+            import kivy.core.window     # not needed directly, import to ensure creation of window render context
+            self._relief_shader_ctx = RenderContext(fs=RELIEF_ELLIPSE_FS, use_parent_modelview=True,
+                                                    use_parent_projection=True, use_parent_frag_modelview=True)
+            with self._relief_shader_ctx:
+                self._relief_shader_quad = Rectangle()
+            self._relief_shader_ctx['angle_beg'] = float(ANGLE_BEG)
+            self._relief_shader_ctx['angle_end'] = float(ANGLE_END)
+
+        render_ctx = self._relief_shader_ctx
+        render_ctx['inner_lines'] = render_ctx['outer_lines'] = 0.0
+        outer_lines = 0
+        for kind, (top_color, bottom_color), lines, offset in bands:
+            prefix = 'inner' if kind == 'ellipse_inner' else 'outer'
+            render_ctx[prefix + '_lines'] = float(lines)
+            render_ctx[prefix + '_top'] = [float(col) for col in top_color] + [1.0]
+            render_ctx[prefix + '_bottom'] = [float(col) for col in bottom_color] + [1.0]
+            if prefix == 'inner':
+                render_ctx['inner_offset'] = float(offset)
+            else:
+                outer_lines = lines
+
+        margin = outer_lines + 1.0                              # plus one pixel for the anti-aliasing
+        quad_size = [self.width + 2 * margin, self.height + 2 * margin]
+        render_ctx['quad_size'] = quad_size
+        render_ctx['radius'] = [max(self.width / 2, 1.0), max(self.height / 2, 1.0)]
+        render_ctx['opacity'] = float(getattr(self, 'opacity', 1.0))
+        self._relief_shader_quad.pos = self.x - margin, self.y - margin
+        self._relief_shader_quad.size = quad_size
+        if rebuild:
+            self._relief_graphic_instructions.add(render_ctx)
+
+    @staticmethod
+    def _relief_band_lines(kind: str, lines: int, offset: int,
+                           wid_x: float, wid_y: float, wid_width: float, wid_height: float
+                           ) -> List[ReliefLineGeometry]:
+        """ calculate alpha and line points/ellipse geometries of a relief band from its cached line table.
+
+        :param kind:            relief band kind (see :meth:`._relief_bands`).
+        :param lines:           number of relief lines.
+        :param offset:          relief offset (zero for outer reliefs).
+        :param wid_x:           x coordinate of the widget.
+        :param wid_y:           y coordinate of the widget.
+        :param wid_width:       widget width.
+        :param wid_height:      widget height.
+        :return:                list of (alpha, top left geometry, bottom right geometry) tuples, one for each line.
+        """
+        alphas, dists = relief_line_table(lines, offset)
+        if kind.endswith('outer'):
+            dists = [-dist for dist in dists]
+        wid_x2 = wid_x + wid_width
+        wid_y2 = wid_y + wid_height
+
+        if kind.startswith('ellipse'):
+            return [(alpha,
+                     [wid_x + dist, wid_y + dist, wid_width - 2 * dist, wid_height - 2 * dist,
+                      ANGLE_END, 360 + ANGLE_BEG],                                          # top left
+                     [wid_x + dist, wid_y + dist, wid_width - 2 * dist, wid_height - 2 * dist,
+                      ANGLE_BEG, ANGLE_END])                                                # bottom right
+                    for alpha, dist in zip(alphas, dists)]
+
+        return [(alpha,
+                 [wid_x + dist, wid_y + dist, wid_x + dist, wid_y2 - dist, wid_x2 - dist, wid_y2 - dist],  # top left
+                 [wid_x + dist, wid_y + dist, wid_x2 - dist, wid_y + dist, wid_x2 - dist, wid_y2 - dist])  # bottom rgt
+                for alpha, dist in zip(alphas, dists)]
 
 
 class ReliefLabel(ReliefCanvas, Label):
@@ -224,6 +814,9 @@ if __name__ == '__main__':
 
 <ReliefHelpToggler@ReliefCanvas+HelpToggler>:
 
+<ReliefCanvas>:
+    relief_render_mode: app.app_states['relief_render_mode']
+
 <Main@FloatLayout>:
     BoxLayout:
         orientation: 'vertical'
@@ -241,9 +834,14 @@ if __name__ == '__main__':
                 relief_square_outer_lines: app.main_app.correct_num_prop_value(squ_out.text)
                 relief_square_inner_lines: app.main_app.correct_num_prop_value(squ_inn.text)
                 relief_square_inner_offset: app.main_app.correct_num_prop_value(squ_off.text)
-            FlowButton:
-                text: "toggle theme"
-                on_release: app.main_app.change_app_state('light_theme', not app.app_states['light_theme'])
+            BoxLayout:
+                orientation: 'vertical'
+                FlowButton:
+                    text: "toggle theme"
+                    on_release: app.main_app.change_app_state('light_theme', not app.app_states['light_theme'])
+                FlowButton:
+                    text: "render " + app.app_states['relief_render_mode']
+                    on_release: app.main_app.cycle_relief_render_mode()
             BoxLayout:
                 orientation: 'vertical'
                 size_hint_x: 3
@@ -398,27 +996,25 @@ if __name__ == '__main__':
     Factory.register('ReliefCanvas', ReliefCanvas)
 
 
-    class NumPropTester(Widget):
-        """ test NumericProperty values """
-        num_prop = NumericProperty()
-
-
     class ReliefCanvasApp(KivyMainApp):
         """ app """
         color_picker: Any = None
         color_dropdown: Any = None
+        relief_render_mode: str = 'lines'                   #: app state of the render mode of all relief widgets
 
         @staticmethod
         def correct_num_prop_value(num_prop_value: Union[str, int, float]) -> Union[str, int, float]:
-            """ test if num_prop_value has a valid/assignable NumericProperty value and if not correct it to 21sp """
-            wid = NumPropTester()
-            try:
-                wid.num_prop = num_prop_value
-            except ValueError:
+            """ test if num_prop_value has a valid/assignable NumericProperty value and if not correct it to 99px """
+            if num_prop_pixels(num_prop_value) is None:
                 print(f"ReliefCanvasApp.correct_num_prop_value() got invalid numeric property value '{num_prop_value}'")
                 return DEF_NUM_PROP_VAL
             return num_prop_value
 
+        def cycle_relief_render_mode(self):
+            """ switch the render mode of all relief widgets to the next available mode """
+            mode_idx = RELIEF_RENDER_MODES.index(self.relief_render_mode)
+            self.change_app_state('relief_render_mode', RELIEF_RENDER_MODES[(mode_idx + 1) % len(RELIEF_RENDER_MODES)])
+
         def debug_print(self, *args, **kwargs):
             """ added to find out why the color got lightened when opening color picker dropdown. """
             print("APP_DEBUG_PRINT", args, kwargs)
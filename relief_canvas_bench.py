@@ -0,0 +1,156 @@
+""" headless benchmark of the relief canvas rendering (see relief_canvas.py).
+
+runs without a GPU/display, using the mock GL backend of kivy and a headless window (see headless_window.py).
+example call::
+
+    python relief_canvas_bench.py --widgets 120 --steps 30 --output bench_output.txt
+
+the results get printed (or written into the file specified by the ``--output`` option) in JSON format.
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from functools import wraps
+from itertools import product
+from typing import Any, Dict, List
+
+from headless_window import install_headless_window
+install_headless_window()
+
+import kivy                                                     # noqa: E402
+from kivy.clock import Clock                                    # noqa: E402
+
+from ae.kivy_app import KivyMainApp                             # noqa: E402
+
+import relief_canvas                                            # noqa: E402
+from relief_canvas import (                                     # noqa: E402
+    RELIEF_RENDER_MODES, ReliefButton, ReliefCanvas, ReliefFlowToggler, ReliefLabel, relief_colors)
+
+
+BENCH_CLASSES = dict(ReliefLabel=ReliefLabel, ReliefButton=ReliefButton, ReliefFlowToggler=ReliefFlowToggler)
+BENCH_LINES = (3, 9, 18)
+BENCH_OFFSETS = (0, 3)
+
+
+class RefreshCounter:
+    """ counts and times the calls of :meth:`~relief_canvas.ReliefCanvas._relief_refresh`. """
+    def __init__(self):
+        self.calls = 0
+        self.instructions = 0
+        self.durations: List[float] = list()
+        self.original_refresh = ReliefCanvas._relief_refresh
+
+    def install(self):
+        """ wrap the refresh method of the relief canvas (has to be done before the widgets get created). """
+        original_refresh = self.original_refresh
+
+        @wraps(original_refresh)                        # keep the method name for the weak method of the clock trigger
+        def _counting_refresh(wid: Any, *args):
+            structure = wid._relief_structure
+            beg = time.perf_counter()
+            original_refresh(wid, *args)
+            self.durations.append(time.perf_counter() - beg)
+            self.calls += 1
+            if wid._relief_structure != structure:          # rebuild: all instructions of the group got created
+                self.instructions += wid._relief_graphic_instructions.length()
+
+        ReliefCanvas._relief_refresh = _counting_refresh
+
+    def uninstall(self):
+        """ restore the original refresh method. """
+        ReliefCanvas._relief_refresh = self.original_refresh
+
+    def reset(self):
+        """ reset counters. """
+        self.calls = self.instructions = 0
+        self.durations.clear()
+
+
+def bench_case(counter: RefreshCounter, wid_class: Any, render_mode: str, lines: int, offset: int,
+               widgets: int, steps: int) -> Dict[str, Any]:
+    """ run a single benchmark case of the matrix.
+
+    :param counter:             installed refresh counter.
+    :param wid_class:           relief widget class to instantiate.
+    :param render_mode:         relief render mode.
+    :param lines:               number of relief lines of all relief bands.
+    :param offset:              offset of the inner relief bands.
+    :param widgets:             number of widgets to create.
+    :param steps:               number of pos/size churn steps.
+    :return:                    dict with the results of this case.
+    """
+    counter.reset()
+    colors = relief_colors((0.42, 0.63, 0.93))
+    beg = time.perf_counter()
+    wids = [wid_class(relief_render_mode=render_mode,
+                      relief_ellipse_inner_colors=colors, relief_ellipse_outer_colors=colors,
+                      relief_ellipse_inner_lines=lines, relief_ellipse_outer_lines=lines,
+                      relief_ellipse_inner_offset=offset,
+                      relief_square_inner_colors=colors, relief_square_outer_colors=colors,
+                      relief_square_inner_lines=lines, relief_square_outer_lines=lines,
+                      relief_square_inner_offset=offset,
+                      size_hint=(None, None))
+            for _ in range(widgets)]
+    Clock.tick()
+
+    for step in range(steps):
+        for idx, wid in enumerate(wids):
+            wid.pos = (idx % 12) * 90 + step, (idx // 12) * 60 + step
+            wid.size = 81 + step % 9, 42 + step % 6
+        Clock.tick()
+    wall_time = time.perf_counter() - beg
+
+    durations = sorted(counter.durations)
+    return dict(
+        widget_class=wid_class.__name__, render_mode=render_mode, lines=lines, offset=offset,
+        widgets=widgets, steps=steps,
+        refresh_calls=counter.calls,
+        coalesced_refreshes=sum(wid.relief_coalesced_refreshes for wid in wids),
+        instructions_created=counter.instructions,
+        refresh_time_mean_us=sum(durations) / len(durations) * 1e6 if durations else 0.0,
+        refresh_time_p95_us=durations[int(len(durations) * 0.95)] * 1e6 if durations else 0.0,
+        wall_time_s=wall_time,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    )
+
+
+def main(argv: List[str]) -> int:
+    """ parse command line arguments, run the benchmark matrix and output the results as JSON. """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--widgets', type=int, default=90, help="number of widgets per case")
+    parser.add_argument('--steps', type=int, default=12, help="number of pos/size churn steps per case")
+    parser.add_argument('--classes', nargs='+', default=list(BENCH_CLASSES), choices=list(BENCH_CLASSES))
+    parser.add_argument('--modes', nargs='+', default=list(RELIEF_RENDER_MODES), choices=RELIEF_RENDER_MODES)
+    parser.add_argument('--lines', nargs='+', type=int, default=list(BENCH_LINES))
+    parser.add_argument('--offsets', nargs='+', type=int, default=list(BENCH_OFFSETS))
+    parser.add_argument('--output', default='', help="JSON output file (default: print to stdout)")
+    args = parser.parse_args(argv)
+
+    KivyMainApp(app_name='relief_canvas')   # ae widget kv rules need a (not running) app instance
+    counter = RefreshCounter()
+    counter.install()
+    try:
+        cases = [bench_case(counter, BENCH_CLASSES[cls_name], mode, lines, offset, args.widgets, args.steps)
+                 for cls_name, mode, lines, offset in product(args.classes, args.modes, args.lines, args.offsets)]
+    finally:
+        counter.uninstall()
+
+    report = dict(
+        python=platform.python_version(), kivy=kivy.__version__, module=relief_canvas.__file__,
+        atlas=relief_canvas.relief_texture_atlas.stats(),
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        cases=cases)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file_handle:
+            file_handle.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
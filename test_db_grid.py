@@ -0,0 +1,78 @@
+""" tests of the keyset pagination of db_grid.py """
+import os
+import random
+import sqlite3
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+import pytest                                                   # noqa: E402
+
+from db_grid import DB_COLUMNS, DbPagedSource                  # noqa: E402
+
+
+TEST_ROWS = 2000
+TEST_PAGE_ROWS = 50
+
+
+@pytest.fixture(scope='module')
+def connection():
+    """ in-memory Callbacks table, with 30% NULL values in each table column. """
+    rnd = random.Random(69)
+    db_connection = sqlite3.connect(':memory:')
+    db_connection.execute("CREATE TABLE Callbacks(cID INT, cName TEXT, cbTime INT, cbRems TEXT)")
+    db_connection.executemany(
+        "INSERT INTO Callbacks VALUES (?, ?, ?, ?)",
+        [tuple(None if rnd.random() < 0.3 else value
+               for value in (rnd.randint(0, 90), f"Client{rnd.randint(0, 90)}", rnd.randint(0, 90), f"R{idx % 7}"))
+         for idx in range(TEST_ROWS)])
+    yield db_connection
+    db_connection.close()
+
+
+def expected_rows(db_connection, sort_col, sort_desc):
+    """ all rows in the sort order of the grid (NULL values first in ascending order, like in SQLite). """
+    col_id = DB_COLUMNS.index(sort_col)
+    rows = db_connection.execute("SELECT ROWID, * FROM Callbacks").fetchall()
+    return sorted(rows, key=lambda row: (row[col_id] is not None, row[col_id] or 0, row[0]), reverse=sort_desc)
+
+
+def fetch_page(db_connection, source, direction):
+    """ fetch a page and add it to the window of the source, returning False if there are no more rows. """
+    query = source.page_query(direction)
+    if query is None:
+        return False
+    return source.add_page(direction, db_connection.execute(*query).fetchall()) is not None
+
+
+@pytest.mark.parametrize('sort_desc', [False, True])
+@pytest.mark.parametrize('sort_col', DB_COLUMNS)
+def test_next_pages_include_null_values(connection, sort_col, sort_desc):
+    source = DbPagedSource(page_rows=TEST_PAGE_ROWS, max_pages=TEST_ROWS // TEST_PAGE_ROWS + 1)
+    source.set_criteria(sort_col, sort_desc, {})
+    fetch_page(connection, source, 'first')
+    while fetch_page(connection, source, 'next'):
+        pass
+
+    assert source.at_end
+    assert source.rows() == expected_rows(connection, sort_col, sort_desc)
+
+
+@pytest.mark.parametrize('sort_desc', [False, True])
+@pytest.mark.parametrize('sort_col', DB_COLUMNS)
+def test_prev_pages_include_null_values(connection, sort_col, sort_desc):
+    source = DbPagedSource(page_rows=TEST_PAGE_ROWS, max_pages=3)
+    source.set_criteria(sort_col, sort_desc, {})
+    fetch_page(connection, source, 'first')
+    while fetch_page(connection, source, 'next'):
+        pass
+    expected = expected_rows(connection, sort_col, sort_desc)
+    assert source.rows() == expected[-len(source.rows()):]
+
+    while fetch_page(connection, source, 'prev'):
+        rows = source.rows()
+        beg = expected.index(rows[0])
+        assert rows == expected[beg:beg + len(rows)]
+
+    assert source.at_begin
+    assert source.rows() == expected[:TEST_PAGE_ROWS * 3]
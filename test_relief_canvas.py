@@ -0,0 +1,33 @@
+""" tests of the numeric property value validation of relief_canvas.py """
+import pytest
+
+from headless_window import install_headless_window
+install_headless_window()
+
+from kivy.event import EventDispatcher                          # noqa: E402
+from kivy.properties import NumericProperty                     # noqa: E402
+
+from relief_canvas import num_prop_pixels                       # noqa: E402
+
+
+class NumPropHolder(EventDispatcher):
+    """ kivy reference conversion of NumericProperty values. """
+    value = NumericProperty(0)
+
+
+@pytest.mark.parametrize('value', [6, 6.5, -3, '6', '6.5', '-3', '-2.5', ' 6 ', '6px', '6.5dp', '-3sp', '-0.5sp', '2mm',
+                                   '1in', '0'])
+def test_valid_values_are_converted_like_kivy(value):
+    holder = NumPropHolder()
+    holder.value = value
+
+    assert num_prop_pixels(value) == pytest.approx(holder.value)
+
+
+@pytest.mark.parametrize('value', ['', 'sp', '6xx', 'six', '6 s p', '--3sp', None, (6, ), [6]])
+def test_invalid_values_are_rejected_like_kivy(value):
+    holder = NumPropHolder()
+    with pytest.raises((ValueError, TypeError)):
+        holder.value = value
+
+    assert num_prop_pixels(value) is None